@@ -1,21 +1,68 @@
+import atexit
 import logging
-from logging.handlers import RotatingFileHandler
+import os
+import queue
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+# INFO by default; set LOG_LEVEL=DEBUG for local development
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+
+LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+# Handlers run on QueueListener threads so logging calls on the event loop
+# (or in a worker) only enqueue the record instead of writing to the stream
+_listeners: list = []
+
+
+def _start_listener(*handlers: logging.Handler) -> QueueHandler:
+    log_queue = queue.SimpleQueue()
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    _listeners.append(listener)
+    return QueueHandler(log_queue)
+
+
+def _stop_listeners():
+    for listener in _listeners:
+        listener.stop()
+
+
+def _restart_listeners():
+    for i, listener in enumerate(_listeners):
+        _listeners[i] = QueueListener(
+            listener.queue, *listener.handlers, respect_handler_level=True
+        )
+        _listeners[i].start()
+
+
+atexit.register(_stop_listeners)
+if hasattr(os, "register_at_fork"):
+    # Listener threads don't survive fork (e.g. Celery prefork workers): drain
+    # and stop them before forking, then start fresh ones on both sides
+    os.register_at_fork(
+        before=_stop_listeners,
+        after_in_parent=_restart_listeners,
+        after_in_child=_restart_listeners,
+    )
+
+_console_queue_handler = None
 
 
 def get_logger(name: str = "app", log_file: str = None) -> logging.Logger:
     """Get a logger instance with console and optional file output."""
+    global _console_queue_handler
+
     logger = logging.getLogger(name)
-    logger.setLevel(logging.DEBUG)
+    logger.setLevel(LOG_LEVEL)
 
     if not logger.handlers:
-        # Console handler
-        console_handler = logging.StreamHandler()
-        console_handler.setLevel(logging.DEBUG)
-        console_formatter = logging.Formatter(
-            "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-        )
-        console_handler.setFormatter(console_formatter)
-        logger.addHandler(console_handler)
+        # Console handler (one listener shared by all loggers)
+        if _console_queue_handler is None:
+            console_handler = logging.StreamHandler()
+            console_handler.setLevel(logging.DEBUG)
+            console_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+            _console_queue_handler = _start_listener(console_handler)
+        logger.addHandler(_console_queue_handler)
 
         # Optional file handler
         if log_file:
@@ -23,11 +70,8 @@ def get_logger(name: str = "app", log_file: str = None) -> logging.Logger:
                 log_file, maxBytes=5_000_000, backupCount=5
             )
             file_handler.setLevel(logging.DEBUG)
-            file_formatter = logging.Formatter(
-                "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-            )
-            file_handler.setFormatter(file_formatter)
-            logger.addHandler(file_handler)
+            file_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+            logger.addHandler(_start_listener(file_handler))
 
     logger.propagate = False
     return logger
@@ -2,7 +2,7 @@ from fastapi import Request
 from fastapi.responses import JSONResponse
 from fastapi.exceptions import RequestValidationError
 from starlette.exceptions import HTTPException as StarletteHTTPException
-import traceback
+from app.config.log_config import get_logger
 
 from .custom_exception import (
     BaseAppException,
@@ -12,13 +12,19 @@ from .custom_exception import (
 )
 
 
+logger = get_logger("exception_handler")
+
+
 def register_exception_handlers(app):
     """Register all exception handlers on the given FastAPI app instance"""
 
     @app.exception_handler(BaseAppException)
     async def base_app_exception_handler(request: Request, exc: BaseAppException):
-        print(
-            f"🔥 Custom exception caught: {exc.error}, {exc.details}, status: {exc.status_code}"
+        logger.warning(
+            "Custom exception caught: %s, %s, status: %s",
+            exc.error,
+            exc.details,
+            exc.status_code,
         )
         return JSONResponse(
             status_code=exc.status_code,
@@ -51,8 +57,7 @@ def register_exception_handlers(app):
 
     @app.exception_handler(Exception)
     async def unhandled_exception_handler(request: Request, exc: Exception):
-        print(f"🚨 Unhandled exception: {str(exc)}")
-        traceback.print_exc()
+        logger.error("Unhandled exception: %s", exc, exc_info=exc)
         return JSONResponse(
             status_code=500,
             content=ExceptionResponse(
@@ -61,4 +66,4 @@ def register_exception_handlers(app):
             ).model_dump(),
         )
 
-    print("✅ Exception handlers registered successfully")
+    logger.debug("Exception handlers registered successfully")
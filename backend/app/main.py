@@ -1,7 +1,7 @@
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.params import Depends
-from app.db.database import create_tables, get_sync_db
+from app.db.database import AsyncSession, create_tables, get_pool_stats, get_sync_db
 from app.routes.counselor_route import router as counselor_router
 from app.routes.session_route import router as session_router
 from app.routes.catalog_route import router as catalog_router
@@ -10,6 +10,7 @@ from app.routes.raw_transcript_route import router as raw_transcript_router
 from app.routes.cloudinary_route import router as cloudinary_test_router
 from contextlib import asynccontextmanager
 import uvicorn
+from sqlalchemy import text
 from sqlalchemy.orm import Session
 
 from app.exceptions.global_exception_handler import register_exception_handlers
@@ -29,8 +30,14 @@ logger = get_logger("CounselPro")
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     await create_tables()
+
+    # Prewarm: open a pooled connection so the first request doesn't pay for it
+    async with AsyncSession() as db:
+        await db.execute(text("SELECT 1"))
+        logger.info("Prewarmed database connection pool")
+
     for route in app.routes:
-        print("🚀 Loaded route:", route.path, route.methods)
+        logger.debug("🚀 Loaded route: %s %s", route.path, route.methods)
     yield
 
 
@@ -93,6 +100,11 @@ async def root():
     return {"message": "AI-Powered Counselor Excellence System"}
 
 
+@app.get("/health/db-pool", tags=["Health Check"])
+async def db_pool_stats():
+    return get_pool_stats()
+
+
 # @app.post("/email/test", tags=["Test Email"])
 # async def test_email(email: str):
 #     """
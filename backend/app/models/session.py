@@ -1,13 +1,17 @@
 import uuid
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.sql import func
+from sqlalchemy.sql import func, text
 from sqlalchemy.orm import relationship
 from app.db.database import Base
 
 
 class CounselingSession(Base):
     __tablename__ = "counseling_sessions"
+    __table_args__ = (
+        # Serves get_sessions_by_counselor: filter on counselor, newest first
+        Index("ix_session_counselor_id_desc", "counselor_id", text("id DESC")),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True, nullable=False)
     uid = Column(UUID(as_uuid=False), default=uuid.uuid4, unique=True, nullable=False)
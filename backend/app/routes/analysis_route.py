@@ -14,6 +14,9 @@ from app.schemas.counselor_schema import (
     CounselorResponse,
 )
 from app.db.database import get_async_db
+from app.config.log_config import get_logger
+
+logger = get_logger("analysis_route")
 
 router = APIRouter(prefix="/counselors", tags=["Counselors"])
 
@@ -22,8 +25,7 @@ router = APIRouter(prefix="/counselors", tags=["Counselors"])
 async def create_counselor_route(
     counselor: CounselorCreate, db: AsyncSession = Depends(get_async_db)
 ):
-    print("=" * 100)
-    print(f"Creating counselor with data: {counselor}")
+    logger.debug("Creating counselor with data: %s", counselor)
     return await create_counselor(db, counselor)
 
 
@@ -1,14 +1,16 @@
 from uuid import UUID
 from fastapi import APIRouter, Depends, Query, BackgroundTasks
+from fastapi.responses import ORJSONResponse
 from app.models.video_analysis import VideoAnalysisResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from app.service.celery.celery_worker import process_video
 from app.db.database import SyncSessionLocal
 from app.db.database import get_sync_db
 
 from app.db.database import get_async_db
+from app.config.log_config import get_logger
 from app.schemas.session_schema import (
     SessionCreate,
     SessionUpdate,
@@ -22,13 +24,19 @@ from app.service.session_service import (
     get_sessions_by_counselor,
     update_session,
     delete_session,
-    process_video_background,
     get_session_by_id_sync,
 )
 
+logger = get_logger("session_route")
+
 router = APIRouter(prefix="/sessions", tags=["Counseling Sessions"])
 
 
+def _next_cursor(items: List[dict], limit: int) -> Optional[str]:
+    # A short page means there is nothing after it
+    return items[-1]["uid"] if len(items) == limit else None
+
+
 @router.post("/", response_model=SessionResponse)
 async def create_counseling_session(
     session_in: SessionCreate,
@@ -40,22 +48,31 @@ async def create_counseling_session(
     return session
 
 
-@router.get("/all", response_model=SessionListResponse)
+@router.get(
+    "/all", response_model=SessionListResponse, response_class=ORJSONResponse
+)
 async def list_all_sessions(
     skip: int = Query(0, ge=0),
     limit: int = Query(10, ge=1, le=100),
+    cursor: Optional[UUID] = Query(
+        None, description="uid of the last session seen; replaces skip"
+    ),
     db: AsyncSession = Depends(get_async_db),
 ):
     """
     Get all counseling sessions, paginated
     """
-    items, total = await get_all_sessions(db, skip=skip, limit=limit)
-    return {
-        "items": items,
-        "total": total,
-        "skip": skip,
-        "limit": limit,
-    }
+    items, total = await get_all_sessions(db, skip=skip, limit=limit, cursor=cursor)
+    # items are already SessionResponse-shaped dicts, so skip re-validation
+    return ORJSONResponse(
+        {
+            "items": items,
+            "total": total,
+            "skip": skip,
+            "limit": limit,
+            "next_cursor": _next_cursor(items, limit),
+        }
+    )
 
 
 @router.get("/{session_uid}", response_model=SessionResponse)
@@ -65,22 +82,32 @@ async def get_counseling_session(
     return await get_session_by_id(db, session_uid)
 
 
-@router.get("/by-counselor/{counselor_uid}", response_model=SessionListResponse)
+@router.get(
+    "/by-counselor/{counselor_uid}",
+    response_model=SessionListResponse,
+    response_class=ORJSONResponse,
+)
 async def list_sessions_by_counselor(
     counselor_uid: str,
     skip: int = Query(0, ge=0),
     limit: int = Query(10, ge=1, le=100),
+    cursor: Optional[UUID] = Query(
+        None, description="uid of the last session seen; replaces skip"
+    ),
     db: AsyncSession = Depends(get_async_db),
 ):
     items, total = await get_sessions_by_counselor(
-        db, counselor_uid=counselor_uid, skip=skip, limit=limit
+        db, counselor_uid=counselor_uid, skip=skip, limit=limit, cursor=cursor
+    )
+    return ORJSONResponse(
+        {
+            "items": items,
+            "total": total,
+            "skip": skip,
+            "limit": limit,
+            "next_cursor": _next_cursor(items, limit),
+        }
     )
-    return {
-        "items": items,
-        "total": total,
-        "skip": 0,
-        "limit": 1,
-    }
 
 
 @router.put("/{session_uid}", response_model=SessionResponse)
@@ -101,17 +128,20 @@ async def delete_counseling_session(
 
 @router.get("/{session_uid}/analysis")
 async def get_session_analysis(
-    session_id: UUID, db: AsyncSession = Depends(get_async_db)
+    session_uid: UUID, db: AsyncSession = Depends(get_async_db)
 ):
-    results = await process_video_background(db, session_id)
-    return results
+    # 404 early, then hand the analysis to a Celery worker so no request
+    # (or pooled DB connection) is held for the length of the video
+    session = await get_session_by_id(db, session_uid)
+    task = process_video.delay(str(session_uid), str(session.recording_link))
+    return {"task_id": task.id, "status": "STARTED"}
 
 
 @router.get("/{session_uid}/analysis_by_celery")
 async def get_session_analysis_using_celery_background_task(
     session_uid: str, db: Session = Depends(get_sync_db)
 ):
-    print(f"Starting video processing for session {session_uid}")
+    logger.info("Starting video processing for session %s", session_uid)
     sessionResponse = get_session_by_id_sync(db, session_uid)
 
     video_path = sessionResponse.recording_link
@@ -1,7 +1,7 @@
 from datetime import datetime
 from uuid import UUID
 from pydantic import BaseModel, HttpUrl, Field
-from typing import List
+from typing import List, Optional
 
 
 # Base schema (shared fields)
@@ -48,5 +48,7 @@ class SessionListResponse(BaseModel):
     total: int
     skip: int
     limit: int
+    # uid to pass as `cursor` for the next page; None on the last page
+    next_cursor: Optional[str] = None
 
     model_config = {"from_attributes": True}
@@ -5,6 +5,6 @@ This module provides utilities for audio processing and transcription,
 particularly for converting audio chunks to text using speech recognition APIs.
 """
 
-from .deepgram_transcriber import DeepgramTranscriber
+from .deepgram_transcriber import DeepgramTranscriber, get_deepgram_transcriber
 
-__all__ = ['DeepgramTranscriber']
+__all__ = ['DeepgramTranscriber', 'get_deepgram_transcriber']
@@ -4,6 +4,7 @@ import sys
 import json
 import time
 import logging
+from functools import lru_cache
 from datetime import datetime
 from pathlib import Path
 from typing import List, Dict, Any, Optional
@@ -135,12 +136,14 @@ class DeepgramTranscriber:
             utt_split=0.8
         )
         
+        # Hand the open file to the SDK as a stream instead of reading the
+        # whole audio file into a bytes buffer first
         with open(chunk_path, 'rb') as audio_file:
-            payload: FileSource = {"buffer": audio_file.read()}
-        
-        start_time = time.time()
-        response = self.client.listen.rest.v("1").transcribe_file(payload, options)  # type: ignore
-        processing_time = time.time() - start_time
+            payload: FileSource = {"stream": audio_file}
+            
+            start_time = time.time()
+            response = self.client.listen.rest.v("1").transcribe_file(payload, options)  # type: ignore
+            processing_time = time.time() - start_time
         
         utterances = self._extract_utterances(response.to_dict())  # type: ignore
         
@@ -190,3 +193,9 @@ class DeepgramTranscriber:
 
 # if __name__ == "__main__":
 #     main()
+
+
+@lru_cache(maxsize=1)
+def get_deepgram_transcriber() -> DeepgramTranscriber:
+    """Return the per-process transcriber so the Deepgram client is reused."""
+    return DeepgramTranscriber()
@@ -1,5 +1,7 @@
+import asyncio
 import logging
 import os
+import shutil
 from pathlib import Path
 from uuid import UUID
 from typing import List
@@ -13,6 +15,16 @@ from app.service.course_verification.catalog_indexer import CourseCatalogIndexer
 
 logger = logging.getLogger(__name__)
 
+# Block size when copying an upload to disk
+UPLOAD_COPY_CHUNK_SIZE = 8 * 1024 * 1024
+
+
+def _copy_upload(src, file_path: Path) -> int:
+    """Stream an upload's spooled file to disk; returns the bytes written."""
+    with open(file_path, "wb") as buffer:
+        shutil.copyfileobj(src, buffer, length=UPLOAD_COPY_CHUNK_SIZE)
+        return buffer.tell()
+
 
 async def save_uploaded_file(db: AsyncSession, file: UploadFile) -> CatalogFile:
     # Validate file type
@@ -35,13 +47,9 @@ async def save_uploaded_file(db: AsyncSession, file: UploadFile) -> CatalogFile:
     # Generate file path
     file_path = catalog_dir / f"{file.filename}"
 
-    # Save file
-    with open(file_path, "wb") as buffer:
-        content = await file.read()
-        buffer.write(content)
-    
-    # Get file size
-    file_size = len(content)
+    # Save file (copied in blocks on a worker thread rather than read whole
+    # into memory and written from the event loop)
+    file_size = await asyncio.to_thread(_copy_upload, file.file, file_path)
     
     # Create database record
     catalog_file = CatalogFile(
@@ -92,14 +100,12 @@ async def index_catalog_files(db: AsyncSession) -> List[CatalogFile]:
             setattr(file, "chunk_count", chunk_count)
             setattr(file, "indexed_at", datetime.now())
             await db.commit()
-            await db.refresh(file)
             indexed_files.append(file)
             
         except Exception as e:
             logger.error(f"Failed to index {getattr(file, 'filename')}: {e}")
             setattr(file, "status", "failed")
             await db.commit()
-            await db.refresh(file)
             indexed_files.append(file)  # Include failed files in response too
     
     return indexed_files
@@ -149,6 +155,5 @@ async def unindex_catalog_file(db: AsyncSession, file_uid: UUID) -> CatalogFile:
     setattr(file, "chunk_count", 0)
     setattr(file, "indexed_at", None)
     await db.commit()
-    await db.refresh(file)
     
     return file
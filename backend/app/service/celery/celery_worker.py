@@ -1,6 +1,7 @@
 import os
 import uuid
 from celery import Celery
+from celery.signals import worker_process_init
 from dotenv import load_dotenv
 
 from app.models.session import CounselingSession
@@ -14,13 +15,16 @@ from app.service.celery.video_processing_for_celery import (
     create_or_update_session_analysis,
 )
 from app.service.celery.video_processing_for_celery import process_video_background
-from app.db.database import SyncSessionLocal
+from app.db.database import SyncSessionLocal, sync_engine
 from sqlalchemy.orm import joinedload
 
 from app.service.email_service import send_simple_email_template
+from app.config.log_config import get_logger
 
 load_dotenv()
 
+logger = get_logger("celery_worker")
+
 celery_app = Celery(
     "tasks",
     broker=os.getenv("REDIS_URL"),
@@ -28,6 +32,13 @@ celery_app = Celery(
 )
 
 
+@worker_process_init.connect
+def reset_db_pool(**kwargs):
+    # Prefork children inherit the parent's pooled connections; drop them
+    # (without closing the parent's sockets) so each worker opens its own
+    sync_engine.dispose(close=False)
+
+
 @celery_app.task
 def process_video(session_uid: str, video_path: str):
     db = SyncSessionLocal()
@@ -40,14 +51,14 @@ def process_video(session_uid: str, video_path: str):
             .filter(CounselingSession.uid == str(session_uid))
             .first()
         )
-        print("Session:", session_obj)
+        logger.debug("Session: %s", session_obj)
 
         analysis_entry = (
             db.query(SessionAnalysis)
             .filter(SessionAnalysis.session_id == session_obj.id)
             .first()
         )
-        print("Analysis:", analysis_entry)
+        logger.debug("Analysis: %s", analysis_entry)
 
         if not analysis_entry:  # if not found then create new one
             analysis_entry = SessionAnalysis(
@@ -65,33 +76,35 @@ def process_video(session_uid: str, video_path: str):
         # ---- Run pure video processing ----
         results = process_video_background(uuid.UUID(session_uid), video_path)
 
-        # ---- Save transcript ----
+        # ---- Save transcript, analysis and COMPLETED status in one commit ----
         if results.get("transcript_data"):
             transcript_create = RawTranscriptCreate(
                 session_uid=str(session_uid),
                 total_segments=len(results["transcript_data"].get("utterances", [])),
                 raw_transcript=results["transcript_data"],
             )
-            create_or_update_raw_transcript(db, transcript_create)
+            create_or_update_raw_transcript(db, transcript_create, commit=False)
 
-        # ---- Save analysis ----
         session_analysis_create = SessionAnalysisCreate(
             session_uid=str(session_uid),
             video_analysis_data=results["video_analysis_data"],
             audio_analysis_data=results["audio_analysis_data"],
         )
-        saved_analysis = create_or_update_session_analysis(db, session_analysis_create)
+        saved_analysis = create_or_update_session_analysis(
+            db, session_analysis_create, commit=False
+        )
 
-        # COMPLETED
         analysis_entry.status = AnalysisStatus.COMPLETED
         db.commit()
-        print(f"Session analysis saved/updated with UID: {saved_analysis.uid}")
+        logger.info("Session analysis saved/updated with UID: %s", saved_analysis.uid)
 
         # Send email notification
         send_simple_email_template(db, session_uid)
 
     except Exception as e:
-        print(f"Error processing video: {e}")
+        logger.error("Error processing video: %s", e)
+        # Discard any half-flushed transcript/analysis writes before marking FAILED
+        db.rollback()
         if analysis_entry:
             analysis_entry.status = AnalysisStatus.FAILED
             db.commit()
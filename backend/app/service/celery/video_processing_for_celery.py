@@ -1,22 +1,25 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
 from uuid import UUID
 from app.models.raw_transcript import RawTranscript
 from app.schemas.raw_transcript_schema import RawTranscriptCreate, RawTranscriptResponse
-from app.service.video_processing.video_processing import VideoProcessor
+from app.service.video_processing.video_processing import get_video_processor
 from app.service.video_processing.video_extraction import VideoExtractor
-from app.service.audio_processing.deepgram_transcriber import DeepgramTranscriber
-from app.service.course_verification.course_verifier import CourseVerifier
+from app.service.audio_processing.deepgram_transcriber import (
+    get_deepgram_transcriber,
+)
+from app.service.course_verification.course_verifier import get_course_verifier
 from app.config.log_config import get_logger
 from sqlalchemy.exc import SQLAlchemyError
 
 # ============================================================
-from sqlalchemy.orm import joinedload, Session
+from sqlalchemy.orm import Session
 from app.db.database import SyncSessionLocal
 from sqlalchemy.future import select
 from app.models.session_analysis import SessionAnalysis
 from app.models.session import CounselingSession
 from app.schemas.session_analysis_schema import SessionAnalysisCreate
 from app.exceptions.custom_exception import (
-    BadRequestException,
     BaseAppException,
     NotFoundException,
 )
@@ -24,65 +27,80 @@ from app.exceptions.custom_exception import (
 logger = get_logger("video_processing_for_celery")
 
 
+def _transcribe_and_verify(audio_path: str, session_uid: UUID):
+    """Transcribe the audio and verify it against the course catalog."""
+    transcript_data = None
+    audio_analysis_data = None
+
+    try:
+        logger.info("Starting Deepgram transcription for audio: %s", audio_path)
+        transcriber = get_deepgram_transcriber()
+        transcript_data = transcriber.transcribe_chunk(audio_path, str(session_uid))
+        # The transcript dict is large; only format it when DEBUG is on
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Transcript data: %s", transcript_data)
+        logger.info("Transcription completed successfully")
+    except Exception as transcription_error:
+        logger.warning("Transcription failed: %s", transcription_error)
+
+    if transcript_data:
+        try:
+            logger.info("Starting course verification for session %s", session_uid)
+            verifier = get_course_verifier()
+            audio_analysis_data = verifier.verify_full_transcript(transcript_data)
+        except Exception as verification_error:
+            logger.warning("Course verification failed: %s", verification_error)
+
+    return transcript_data, audio_analysis_data
+
+
 def process_video_background(session_uid: UUID, recording_link: str):
     """
     Pure async function for video processing (no DB writes).
     - Extracts video & audio
-    - Runs video analysis
-    - Runs transcription
-    - Runs course verification
+    - Runs video analysis, concurrently with
+      transcription + course verification
     - Returns structured results for DB persistence
     """
 
-    extraction = None
     transcript_data = None
     video_analysis_data = None
     audio_analysis_data = None
 
     try:
-        print(f"Starting video processing for session {session_uid}")
+        logger.info("Starting video processing for session %s", session_uid)
+
+        # ---- Transcription + Course Verification ----
+        # Only depends on the audio, so it runs on a side thread (mostly
+        # waiting on Deepgram/the LLM), started as soon as the audio track is
+        # extracted while the frames are still being decoded and analysed.
+        # The executor exits first (waiting for the transcription), then the
+        # extractor removes its temp directory, on success and failure alike
+        audio_futures = []
+        with VideoExtractor() as extraction, ThreadPoolExecutor(
+            max_workers=1
+        ) as executor:
+
+            def _start_transcription(audio_path):
+                audio_futures.append(
+                    executor.submit(_transcribe_and_verify, audio_path, session_uid)
+                )
 
-        # Extract frames + audio
-        extraction = VideoExtractor()
-        extraction_data = extraction.get_video_frames_and_audio_paths(
-            str(recording_link)
-        )
+            # Extract frames + audio
+            extraction_data = extraction.get_video_frames_and_audio_paths(
+                str(recording_link), on_audio_ready=_start_transcription
+            )
 
-        # ---- Video Analysis ----
-        video_processor = VideoProcessor()
-        video_analysis_data = video_processor.analyze_video_for_celery(extraction_data)
-
-        # ---- Transcription ----
-        audio_path = extraction_data.get("audio_path")
-        if audio_path:
-            try:
-                print(f"Starting Deepgram transcription for audio: {audio_path}")
-                transcriber = DeepgramTranscriber()
-                transcript_data = transcriber.transcribe_chunk(
-                    audio_path, str(session_uid)
-                )
-                print(transcript_data)
-                print("Transcription completed successfully")
-            except Exception as transcription_error:
-                print(f"Warning: Transcription failed: {transcription_error}")
-
-        # ---- Course Verification ----
-        if transcript_data:
-            try:
-                print(f"Starting course verification for session {session_uid}")
-                verifier = CourseVerifier()
-                audio_analysis_data = verifier.verify_full_transcript(transcript_data)
-            except Exception as verification_error:
-                print(f"Warning: Course verification failed: {verification_error}")
-
-        print(f"Video processing completed for session {session_uid}")
-
-        # Cleanup after successful completion
-        # try:
-        #     if extraction:
-        #         extraction.cleanup()
-        # except Exception as cleanup_error:
-        #     logger.warning(f"Error during cleanup: {cleanup_error}")
+            # ---- Video Analysis ----
+            video_processor = get_video_processor()
+            video_analysis_data = video_processor.analyze_video_for_celery(
+                extraction_data
+            )
+
+            if audio_futures:
+                transcript_data, audio_analysis_data = audio_futures[0].result()
+
+        logger.info("Video processing completed for session %s", session_uid)
 
         # ✅ Return all results to Celery task
         return {
@@ -92,38 +110,42 @@ def process_video_background(session_uid: UUID, recording_link: str):
         }
 
     except Exception as e:
-        logger.error(f"Error processing video for session {session_uid}: {e}")
-        # Cleanup on error
-        try:
-            if extraction:
-                extraction.cleanup()
-        except Exception as cleanup_error:
-            logger.warning(f"Error during cleanup: {cleanup_error}")
+        logger.error("Error processing video for session %s: %s", session_uid, e)
         raise
 
 
+def _save(db: Session, instance, commit: bool):
+    """Commit and refresh, or just flush so the caller can commit in one go."""
+    if commit:
+        db.commit()
+        db.refresh(instance)
+    else:
+        db.flush()
+
+
 def create_or_update_session_analysis(
-    db: Session, session_analysis: SessionAnalysisCreate
+    db: Session, session_analysis: SessionAnalysisCreate, commit: bool = True
 ) -> SessionAnalysis:
     """
     Create a new session analysis or update existing one if it already exists.
     This is a synchronous "upsert" operation.
+    With commit=False the changes are only flushed and the caller commits.
     """
 
-    # First get the session by its uid
-    session = (
-        db.query(CounselingSession)
+    # First get the session id by its uid
+    session_id = (
+        db.query(CounselingSession.id)
         .filter(CounselingSession.uid == session_analysis.session_uid)
-        .first()
+        .scalar()
     )
 
-    if not session:
+    if session_id is None:
         raise NotFoundException(details="Session not found")
 
     # Check if analysis already exists for this session
     existing_analysis = (
         db.query(SessionAnalysis)
-        .filter(SessionAnalysis.session_id == session.id)
+        .filter(SessionAnalysis.session_id == session_id)
         .first()
     )
 
@@ -131,132 +153,39 @@ def create_or_update_session_analysis(
         # Update existing analysis
         existing_analysis.video_analysis_data = session_analysis.video_analysis_data
         existing_analysis.audio_analysis_data = session_analysis.audio_analysis_data
-        db.commit()
-        db.refresh(existing_analysis)
-
-        # Reload with relationships
-        analysis = (
-            db.query(SessionAnalysis)
-            .options(
-                joinedload(SessionAnalysis.session).joinedload(
-                    CounselingSession.counselor
-                )
-            )
-            .filter(SessionAnalysis.id == existing_analysis.id)
-            .first()
-        )
-        return analysis
+        db_session_analysis = existing_analysis
     else:
         # Create new analysis
         db_session_analysis = SessionAnalysis(
-            session_id=session.id,
+            session_id=session_id,
             video_analysis_data=session_analysis.video_analysis_data,
             audio_analysis_data=session_analysis.audio_analysis_data,
         )
         db.add(db_session_analysis)
-        db.commit()
-        db.refresh(db_session_analysis)
-
-        # Reload with relationships
-        analysis = (
-            db.query(SessionAnalysis)
-            .options(
-                joinedload(SessionAnalysis.session).joinedload(
-                    CounselingSession.counselor
-                )
-            )
-            .filter(SessionAnalysis.id == db_session_analysis.id)
-            .first()
-        )
-        return analysis
-
-
-def create_raw_transcript(
-    db: Session, transcript_in: RawTranscriptCreate
-) -> RawTranscriptResponse:
-    try:
-        # Find session by UID
-        result = db.execute(
-            select(CounselingSession)
-            .options(joinedload(CounselingSession.counselor))
-            .where(CounselingSession.uid == transcript_in.session_uid)
-        )
-        session = result.scalar_one_or_none()
-
-        if not session:
-            raise NotFoundException(details="Counseling session not found")
-
-        # Check if transcript already exists for this session
-        result = db.execute(
-            select(RawTranscript).where(RawTranscript.session_id == session.id)
-        )
-        existing_transcript = result.scalar_one_or_none()
+    _save(db, db_session_analysis, commit)
 
-        if existing_transcript:
-            raise BadRequestException(
-                details="Transcript already exists for this session"
-            )
-
-        # Create new transcript with session_id
-        new_transcript = RawTranscript(
-            session_id=session.id,
-            total_segments=transcript_in.total_segments,
-            raw_transcript=transcript_in.raw_transcript,
-        )
-
-        db.add(new_transcript)
-        db.commit()
-        db.refresh(new_transcript)
-
-        # Reload with relationships
-        stmt = (
-            select(RawTranscript)
-            .options(
-                joinedload(RawTranscript.session).joinedload(
-                    CounselingSession.counselor
-                )
-            )
-            .where(RawTranscript.id == new_transcript.id)
-        )
-        result = db.execute(stmt)
-        transcript_with_relations = result.scalar_one_or_none()
-
-        return RawTranscriptResponse(
-            uid=transcript_with_relations.uid,
-            total_segments=transcript_with_relations.total_segments,
-            raw_transcript=transcript_with_relations.raw_transcript,
-            created_at=transcript_with_relations.created_at,
-            updated_at=transcript_with_relations.updated_at,
-            session=transcript_with_relations.session,
-        )
-
-    except SQLAlchemyError as e:
-        db.rollback()
-        raise BaseAppException(
-            error="Database Error",
-            details=str(e),
-            status_code=500,
-        )
+    # Primary-key get is served from the identity map (no SELECT); session and
+    # counselor lazy-load on access, which is fine on this sync Session
+    return db.get(SessionAnalysis, db_session_analysis.id)
 
 
 def create_or_update_raw_transcript(
-    db: Session, transcript_in: RawTranscriptCreate
+    db: Session, transcript_in: RawTranscriptCreate, commit: bool = True
 ) -> RawTranscriptResponse:
     try:
-        # Find session by UID
-        result = db.execute(
-            select(CounselingSession)
-            .options(joinedload(CounselingSession.counselor))
-            .where(CounselingSession.uid == transcript_in.session_uid)
+        # Find session id by UID
+        session_id = db.scalar(
+            select(CounselingSession.id).where(
+                CounselingSession.uid == transcript_in.session_uid
+            )
         )
-        session = result.scalar_one_or_none()
 
-        if not session:
+        if session_id is None:
             raise NotFoundException(details="Counseling session not found")
 
         # Check if transcript already exists for this session
         result = db.execute(
-            select(RawTranscript).where(RawTranscript.session_id == session.id)
+            select(RawTranscript).where(RawTranscript.session_id == session_id)
         )
         existing_transcript = result.scalar_one_or_none()
 
@@ -264,37 +193,24 @@ def create_or_update_raw_transcript(
             # Update existing transcript
             existing_transcript.total_segments = transcript_in.total_segments
             existing_transcript.raw_transcript = transcript_in.raw_transcript
-            db.commit()
-            db.refresh(existing_transcript)
             transcript = existing_transcript
             action = "updated"
         else:
             # Create new transcript
             new_transcript = RawTranscript(
-                session_id=session.id,
+                session_id=session_id,
                 total_segments=transcript_in.total_segments,
                 raw_transcript=transcript_in.raw_transcript,
             )
             db.add(new_transcript)
-            db.commit()
-            db.refresh(new_transcript)
             transcript = new_transcript
             action = "created"
+        _save(db, transcript, commit)
 
-        # Reload with relationships
-        stmt = (
-            select(RawTranscript)
-            .options(
-                joinedload(RawTranscript.session).joinedload(
-                    CounselingSession.counselor
-                )
-            )
-            .where(RawTranscript.id == transcript.id)
-        )
-        result = db.execute(stmt)
-        transcript_with_relations = result.scalar_one_or_none()
+        # Served from the identity map; relationships lazy-load on access
+        transcript_with_relations = db.get(RawTranscript, transcript.id)
 
-        print(f"Transcript {action} for session {transcript_in.session_uid}")
+        logger.info("Transcript %s for session %s", action, transcript_in.session_uid)
 
         return RawTranscriptResponse(
             uid=transcript_with_relations.uid,
@@ -1,9 +1,13 @@
 import logging
-from sqlalchemy import desc
+from typing import Optional
+from sqlalchemy import bindparam, desc, func
+from sqlalchemy.engine import Row
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import selectinload
 from app.models.counselor import Counselor
+from app.models.session import CounselingSession
 from app.schemas.counselor_schema import (
     CounselorCreate,
     CounselorUpdate,
@@ -16,6 +20,19 @@ import traceback
 
 logger = logging.getLogger(__name__)
 
+# Built once at import and executed with a bound uid
+_GET_COUNSELOR_REF = select(Counselor.id, Counselor.uid, Counselor.name).where(
+    Counselor.uid == bindparam("counselor_uid")
+)
+
+_COUNT_COUNSELORS = select(func.count()).select_from(Counselor)
+
+
+async def get_counselor_ref(db: AsyncSession, counselor_uid: str) -> Optional[Row]:
+    """Return just the (id, uid, name) row for a counselor, or None."""
+    result = await db.execute(_GET_COUNSELOR_REF, {"counselor_uid": counselor_uid})
+    return result.first()
+
 
 async def create_counselor(
     db: AsyncSession, counselor_in: CounselorCreate
@@ -24,7 +41,6 @@ async def create_counselor(
         new_counselor = Counselor(**counselor_in.model_dump())
         db.add(new_counselor)
         await db.commit()
-        await db.refresh(new_counselor)
         return new_counselor
     except SQLAlchemyError as e:
         await db.rollback()
@@ -60,7 +76,6 @@ async def update_counselor(
         for key, value in updates.model_dump(exclude_unset=True).items():
             setattr(counselor, key, value)
         await db.commit()
-        await db.refresh(counselor)
         return counselor
     except SQLAlchemyError as e:
         await db.rollback()
@@ -73,7 +88,22 @@ async def update_counselor(
 
 async def delete_counselor(db: AsyncSession, counselor_uid: str) -> dict:
     try:
-        counselor = await get_counselor(db, counselor_uid)
+        # The delete cascades through counselor.sessions and each session's
+        # one-to-ones; load them up front with one IN query per relationship
+        # instead of lazy-loading them per session during the flush
+        result = await db.execute(
+            select(Counselor)
+            .options(
+                selectinload(Counselor.sessions).options(
+                    selectinload(CounselingSession.analysis),
+                    selectinload(CounselingSession.raw_transcript),
+                )
+            )
+            .where(Counselor.uid == counselor_uid)
+        )
+        counselor = result.scalars().first()
+        if not counselor:
+            raise NotFoundException(details=f"Counselor {counselor_uid} not found")
         await db.delete(counselor)
         await db.commit()
         return {"message": "Counselor deleted Successfully"}
@@ -89,8 +119,7 @@ async def delete_counselor(db: AsyncSession, counselor_uid: str) -> dict:
 async def get_all_counselors(db: AsyncSession, skip: int = 0, limit: int = 10):
     try:
         # Get total count
-        total_result = await db.execute(select(Counselor))
-        total = len(total_result.scalars().all())
+        total = await db.scalar(_COUNT_COUNSELORS)
 
         # Get paginated items
         query = select(Counselor).order_by(desc(Counselor.id)).offset(skip).limit(limit)
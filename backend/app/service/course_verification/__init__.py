@@ -5,6 +5,6 @@ This module provides RAG-based course information verification capabilities
 for counseling session transcripts using Pinecone and OpenAI.
 """
 
-from .course_verifier import CourseVerifier, CourseInfo, VerificationResult
+from .course_verifier import CourseVerifier, CourseInfo, VerificationResult, get_course_verifier
 
-__all__ = ['CourseVerifier', 'CourseInfo', 'VerificationResult']
+__all__ = ['CourseVerifier', 'CourseInfo', 'VerificationResult', 'get_course_verifier']
@@ -9,6 +9,7 @@ against the official course catalog using RAG (Retrieval Augmented Generation).
 import os
 import json
 import logging
+from functools import lru_cache
 from typing import Dict, List, Any, Optional
 from pydantic import BaseModel, Field
 from dotenv import load_dotenv
@@ -23,6 +24,11 @@ load_dotenv()
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Concurrent LLM requests when verifying the chunks of a long transcript
+VERIFY_MAX_CONCURRENCY = int(os.getenv("VERIFY_MAX_CONCURRENCY", "8"))
+# Catalog documents retrieved as context for each transcript chunk
+RETRIEVAL_TOP_K = 5
+
 
 class CourseInfo(BaseModel):
     """Structured model for course information comparison."""
@@ -80,19 +86,15 @@ class CourseVerifier:
                 embedding=self.embeddings
             )
             
-            # Setup retriever
-            self.retriever = self.vectorstore.as_retriever(
-                search_kwargs={"k": 5}  # Retrieve top 5 relevant documents
-            )
-            
             # Setup LLM
             self.llm = ChatOpenAI(
                 model=self.openai_model,
                 temperature=0.1  # Low temperature for consistency
             )
             
-            # Setup output parser
+            # Setup output parser (format instructions are constant, build once)
             self.output_parser = PydanticOutputParser(pydantic_object=VerificationResult)
+            self.format_instructions = self.output_parser.get_format_instructions()
             
             # Setup prompt template
             self._setup_prompt()
@@ -142,27 +144,61 @@ class CourseVerifier:
         Returns:
             Dictionary containing verification results
         """
+        return self.verify_transcript_chunks([transcript_chunk])[0]
+
+    def verify_transcript_chunks(self, transcript_chunks: List[str]) -> List[Dict[str, Any]]:
+        """
+        Verify several transcript chunks in one go: a single embedding request
+        for all chunks, then the LLM calls batched concurrently.
+        
+        Args:
+            transcript_chunks: Text chunks from counseling session transcript
+            
+        Returns:
+            Verification results, in the same order as the chunks
+        """
         try:
-            logger.info("Starting course verification for transcript chunk")
+            logger.info(f"Starting course verification for {len(transcript_chunks)} transcript chunk(s)")
             
             # Retrieve relevant documents from catalog
-            docs = self.retriever.get_relevant_documents(transcript_chunk)
-            
-            # Combine retrieved documents
-            retrieved_docs = "\n\n---\n\n".join([doc.page_content for doc in docs])
-            
-            logger.info(f"Retrieved {len(docs)} relevant documents")
-            
-            # Format prompt with context and format instructions
-            formatted_prompt = self.prompt.format(
-                transcript_chunk=transcript_chunk,
-                retrieved_docs=retrieved_docs,
-                format_instructions=self.output_parser.get_format_instructions()
+            vectors = self.embeddings.embed_documents(transcript_chunks)
+            prompts = []
+            for transcript_chunk, vector in zip(transcript_chunks, vectors):
+                docs = self.vectorstore.similarity_search_by_vector(vector, k=RETRIEVAL_TOP_K)
+                
+                # Combine retrieved documents
+                retrieved_docs = "\n\n---\n\n".join([doc.page_content for doc in docs])
+                
+                logger.info(f"Retrieved {len(docs)} relevant documents")
+                
+                # Format prompt with context and format instructions
+                prompts.append(self.prompt.format(
+                    transcript_chunk=transcript_chunk,
+                    retrieved_docs=retrieved_docs,
+                    format_instructions=self.format_instructions
+                ))
+            
+            # Get LLM responses
+            responses = self.llm.batch(
+                prompts,
+                config={"max_concurrency": VERIFY_MAX_CONCURRENCY},
+                return_exceptions=True,
             )
+            results = [self._parse_response(response) for response in responses]
+            
+            logger.info("Course verification completed successfully")
             
-            # Get LLM response
-            response = self.llm.invoke(formatted_prompt)
+            return results
             
+        except Exception as e:
+            return [self._chunk_error_result(e) for _ in transcript_chunks]
+
+    def _parse_response(self, response) -> Dict[str, Any]:
+        """Parse one LLM response (or the exception raised for it) into a result."""
+        if isinstance(response, Exception):
+            return self._chunk_error_result(response)
+        
+        try:
             # Parse structured output
             if hasattr(response, 'content'):
                 response_text = response.content
@@ -175,20 +211,19 @@ class CourseVerifier:
             elif not isinstance(response_text, str):
                 response_text = str(response_text)
             
-            verification_result = self.output_parser.parse(response_text)
-            
-            logger.info("Course verification completed successfully")
-            
-            return verification_result.model_dump()
-            
+            return self.output_parser.parse(response_text).model_dump()
         except Exception as e:
-            logger.error(f"Error during course verification: {e}")
-            return {
-                "courses_mentioned": [],
-                "overall_summary": f"Verification failed due to error: {str(e)}",
-                "accuracy_score": 0.0,
-                "red_flags": ["System error during verification"]
-            }
+            return self._chunk_error_result(e)
+
+    def _chunk_error_result(self, error: Exception) -> Dict[str, Any]:
+        """Result for a chunk whose verification failed."""
+        logger.error(f"Error during course verification: {error}")
+        return {
+            "courses_mentioned": [],
+            "overall_summary": f"Verification failed due to error: {str(error)}",
+            "accuracy_score": 0.0,
+            "red_flags": ["System error during verification"]
+        }
     
     def verify_full_transcript(self, transcript_data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -336,21 +371,12 @@ class CourseVerifier:
         accuracy_scores = []
         summaries = []
         
-        for i, chunk in enumerate(chunks):
-            logger.info(f"Processing chunk {i+1}/{len(chunks)}")
-            
-            try:
-                chunk_result = self.verify_transcript_chunk(chunk)
-                
-                # Collect results
-                all_courses.extend(chunk_result.get('courses_mentioned', []))
-                all_red_flags.extend(chunk_result.get('red_flags', []))
-                accuracy_scores.append(chunk_result.get('accuracy_score', 0.0))
-                summaries.append(chunk_result.get('overall_summary', ''))
-                
-            except Exception as e:
-                logger.warning(f"Error processing chunk {i+1}: {e}")
-                all_red_flags.append(f"Processing error in chunk {i+1}: {str(e)}")
+        for chunk_result in self.verify_transcript_chunks(chunks):
+            # Collect results
+            all_courses.extend(chunk_result.get('courses_mentioned', []))
+            all_red_flags.extend(chunk_result.get('red_flags', []))
+            accuracy_scores.append(chunk_result.get('accuracy_score', 0.0))
+            summaries.append(chunk_result.get('overall_summary', ''))
         
         # Merge and deduplicate results
         return self._merge_chunk_results(
@@ -429,3 +455,9 @@ class CourseVerifier:
             "red_flags": ["System error during verification"],
             "session_metadata": {}
         }
+
+
+@lru_cache(maxsize=1)
+def get_course_verifier() -> CourseVerifier:
+    """Return the per-process CourseVerifier so LangChain clients are built once."""
+    return CourseVerifier()
@@ -4,6 +4,7 @@ from email.mime.multipart import MIMEMultipart
 
 # import aiosmtplib
 import smtplib
+import threading
 from dotenv import load_dotenv
 import os
 from app.db.database import get_sync_db
@@ -13,15 +14,41 @@ from app.models.session import CounselingSession
 from sqlalchemy import select
 from sqlalchemy.orm import Session
 from fastapi import APIRouter, Depends, HTTPException
+from app.config.log_config import get_logger
 
 
 load_dotenv()
 
+logger = get_logger("email_service")
+
 
 SMTP_HOST = os.getenv("SMTP_SERVER")
 SMTP_PORT = int(os.getenv("SMTP_PORT", 587))
 SMTP_USER = os.getenv("EMAIL_USERNAME")
 SMTP_PASSWORD = os.getenv("EMAIL_PASSWORD")
+SMTP_TIMEOUT = int(os.getenv("SMTP_TIMEOUT", 30))
+
+# One logged-in SMTP connection per process, reused across emails so each
+# send doesn't pay for the TCP + STARTTLS + AUTH handshake
+_smtp_server = None
+_smtp_lock = threading.Lock()
+
+
+def _smtp_connect() -> smtplib.SMTP:
+    server = smtplib.SMTP(SMTP_HOST, SMTP_PORT, timeout=SMTP_TIMEOUT)
+    server.starttls()
+    server.login(SMTP_USER, SMTP_PASSWORD)
+    return server
+
+
+def _smtp_close():
+    global _smtp_server
+    if _smtp_server is not None:
+        try:
+            _smtp_server.quit()
+        except (smtplib.SMTPException, OSError):
+            pass
+        _smtp_server = None
 
 
 # async def send_email(
@@ -58,10 +85,22 @@ def send_sync_email(
 
     message.attach(MIMEText(body, "html"))
 
-    with smtplib.SMTP(SMTP_HOST, SMTP_PORT) as server:
-        server.starttls()
-        server.login(SMTP_USER, SMTP_PASSWORD)
-        server.send_message(message)
+    global _smtp_server
+    with _smtp_lock:
+        if _smtp_server is not None:
+            try:
+                _smtp_server.send_message(message)
+                return
+            except (smtplib.SMTPServerDisconnected, OSError):
+                # Server dropped the idle connection; reconnect below
+                _smtp_close()
+
+        try:
+            _smtp_server = _smtp_connect()
+            _smtp_server.send_message(message)
+        except (smtplib.SMTPServerDisconnected, OSError):
+            _smtp_close()
+            raise
 
 
 def test_email_sending(recipient_email: str):
@@ -82,10 +121,10 @@ def test_email_sending(recipient_email: str):
 
     try:
         send_sync_email(subject=subject, recipient=recipient_email, body=body)
-        print(f"✅ Test email sent successfully to {recipient_email}")
+        logger.info("Test email sent successfully to %s", recipient_email)
         return True
     except Exception as e:
-        print(f"❌ Error sending test email: {str(e)}")
+        logger.error("Error sending test email: %s", e)
         return False
 
 
@@ -194,7 +233,7 @@ def send_simple_email_template(
         session_obj = result.scalar_one_or_none()
 
         if not session_obj:
-            print(f"❌ No session found with uid {session_uid}")
+            logger.warning("No session found with uid %s", session_uid)
             return False
 
         # 2. Extract counselor info
@@ -210,11 +249,11 @@ def send_simple_email_template(
 
         # 4. Send email
         send_sync_email(subject=subject, recipient=recipient_email, body=body)
-        print(f"✅ Email sent successfully to {recipient_email}")
+        logger.info("Email sent successfully to %s", recipient_email)
         return True
 
     except Exception as e:
-        print(f"❌ Error sending email: {str(e)}")
+        logger.error("Error sending email: %s", e, exc_info=True)
         return False
 
     # 69aac6ee-03d8-4df3-aae4-5fabf59ea03e
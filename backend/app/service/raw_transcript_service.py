@@ -1,6 +1,6 @@
 from uuid import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import delete, select
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import joinedload
 
@@ -27,20 +27,19 @@ async def create_raw_transcript(
     db: AsyncSession, transcript_in: RawTranscriptCreate
 ) -> RawTranscriptResponse:
     try:
-        # Find session by UID
-        result = await db.execute(
-            select(CounselingSession)
-            .options(joinedload(CounselingSession.counselor))
-            .where(CounselingSession.uid == transcript_in.session_uid)
+        # Find session id by UID
+        session_id = await db.scalar(
+            select(CounselingSession.id).where(
+                CounselingSession.uid == transcript_in.session_uid
+            )
         )
-        session = result.scalar_one_or_none()
 
-        if not session:
+        if session_id is None:
             raise NotFoundException(details="Counseling session not found")
 
         # Check if transcript already exists for this session
         result = await db.execute(
-            select(RawTranscript).where(RawTranscript.session_id == session.id)
+            select(RawTranscript).where(RawTranscript.session_id == session_id)
         )
         existing_transcript = result.scalar_one_or_none()
 
@@ -51,14 +50,13 @@ async def create_raw_transcript(
 
         # Create new transcript with session_id
         new_transcript = RawTranscript(
-            session_id=session.id,
+            session_id=session_id,
             total_segments=transcript_in.total_segments,
             raw_transcript=transcript_in.raw_transcript,
         )
 
         db.add(new_transcript)
         await db.commit()
-        await db.refresh(new_transcript)
 
         # Reload with relationships
         stmt = (
@@ -267,7 +265,6 @@ async def update_raw_transcript(
             setattr(transcript, key, value)
 
         await db.commit()
-        await db.refresh(transcript)
 
         return RawTranscriptResponse(
             uid=transcript.uid,
@@ -289,14 +286,15 @@ async def update_raw_transcript(
 
 async def delete_raw_transcript(db: AsyncSession, transcript_uid: str) -> dict:
     try:
-        stmt = select(RawTranscript).where(RawTranscript.uid == transcript_uid)
-        result = await db.execute(stmt)
-        transcript = result.scalar_one_or_none()
+        result = await db.execute(
+            delete(RawTranscript)
+            .where(RawTranscript.uid == transcript_uid)
+            .returning(RawTranscript.id)
+        )
 
-        if not transcript:
+        if result.first() is None:
             raise NotFoundException(details=f"Transcript {transcript_uid} not found")
 
-        await db.delete(transcript)
         await db.commit()
 
         return {"message": "Transcript deleted successfully"}
@@ -1,6 +1,6 @@
 from sqlalchemy.orm import joinedload
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import desc, select, and_
+from sqlalchemy import delete, desc, select, and_
 from app.models.session_analysis import SessionAnalysis
 from app.models.session import CounselingSession
 from app.schemas.session_analysis_schema import (
@@ -18,23 +18,25 @@ from typing import List, Optional
 from datetime import datetime
 from uuid import UUID
 from app.exceptions.custom_exception import BadRequestException, NotFoundException
+from app.config.log_config import get_logger
+
+logger = get_logger("session_analysis_service")
 
 
 async def create_session_analysis(
     db: AsyncSession, session_analysis: SessionAnalysisCreate
 ) -> SessionAnalysis:
-    # First get the session by its uid
-    stmt = select(CounselingSession).where(
+    # First get the session id by its uid
+    stmt = select(CounselingSession.id).where(
         CounselingSession.uid == session_analysis.session_uid
     )
-    result = await db.execute(stmt)
-    session = result.scalar_one_or_none()
+    session_id = await db.scalar(stmt)
 
-    if not session:
+    if session_id is None:
         raise NotFoundException(details="Session not found")
 
     # Check if analysis already exists for this session
-    stmt = select(SessionAnalysis).where(SessionAnalysis.session_id == session.id)
+    stmt = select(SessionAnalysis).where(SessionAnalysis.session_id == session_id)
     result = await db.execute(stmt)
     existing_analysis = result.scalar_one_or_none()
 
@@ -42,13 +44,12 @@ async def create_session_analysis(
         raise BadRequestException(details="Analysis already exists for this session")
 
     db_session_analysis = SessionAnalysis(
-        session_id=session.id,
+        session_id=session_id,
         video_analysis_data=session_analysis.video_analysis_data,
         audio_analysis_data=session_analysis.audio_analysis_data,
     )
     db.add(db_session_analysis)
     await db.commit()
-    await db.refresh(db_session_analysis)
 
     # Reload with relationships
     stmt = (
@@ -96,18 +97,17 @@ async def create_or_update_session_analysis(
     Create a new session analysis or update existing one if it already exists.
     This is an "upsert" operation.
     """
-    # First get the session by its uid
-    stmt = select(CounselingSession).where(
+    # First get the session id by its uid
+    stmt = select(CounselingSession.id).where(
         CounselingSession.uid == session_analysis.session_uid
     )
-    result = await db.execute(stmt)
-    session = result.scalar_one_or_none()
+    session_id = await db.scalar(stmt)
 
-    if not session:
+    if session_id is None:
         raise NotFoundException(details="Session not found")
 
     # Check if analysis already exists for this session
-    stmt = select(SessionAnalysis).where(SessionAnalysis.session_id == session.id)
+    stmt = select(SessionAnalysis).where(SessionAnalysis.session_id == session_id)
     result = await db.execute(stmt)
     existing_analysis = result.scalar_one_or_none()
 
@@ -116,44 +116,27 @@ async def create_or_update_session_analysis(
         existing_analysis.video_analysis_data = session_analysis.video_analysis_data
         existing_analysis.audio_analysis_data = session_analysis.audio_analysis_data
         # updated_at will be automatically set by SQLAlchemy onupdate
-        await db.commit()
-        await db.refresh(existing_analysis)
-
-        # Reload with relationships
-        stmt = (
-            select(SessionAnalysis)
-            .options(
-                joinedload(SessionAnalysis.session).joinedload(
-                    CounselingSession.counselor
-                )
-            )
-            .where(SessionAnalysis.id == existing_analysis.id)
-        )
-        result = await db.execute(stmt)
-        return result.scalar_one()
+        db_session_analysis = existing_analysis
     else:
         # Create new analysis
         db_session_analysis = SessionAnalysis(
-            session_id=session.id,
+            session_id=session_id,
             video_analysis_data=session_analysis.video_analysis_data,
             audio_analysis_data=session_analysis.audio_analysis_data,
         )
         db.add(db_session_analysis)
-        await db.commit()
-        await db.refresh(db_session_analysis)
+    await db.commit()
 
-        # Reload with relationships
-        stmt = (
-            select(SessionAnalysis)
-            .options(
-                joinedload(SessionAnalysis.session).joinedload(
-                    CounselingSession.counselor
-                )
-            )
-            .where(SessionAnalysis.id == db_session_analysis.id)
+    # Reload with relationships
+    stmt = (
+        select(SessionAnalysis)
+        .options(
+            joinedload(SessionAnalysis.session).joinedload(CounselingSession.counselor)
         )
-        result = await db.execute(stmt)
-        return result.scalar_one()
+        .where(SessionAnalysis.id == db_session_analysis.id)
+    )
+    result = await db.execute(stmt)
+    return result.scalar_one()
 
 
 async def update_session_analysis(
@@ -174,27 +157,28 @@ async def update_session_analysis(
         db_analysis.audio_analysis_data = session_analysis.audio_analysis_data
         # updated_at will be automatically set by SQLAlchemy onupdate
         await db.commit()
-        await db.refresh(db_analysis)
     return db_analysis
 
 
 async def delete_session_analysis(db: AsyncSession, uid: str) -> bool:
-    stmt = select(SessionAnalysis).where(SessionAnalysis.uid == uid)
-    result = await db.execute(stmt)
-    db_analysis = result.scalar_one_or_none()
+    result = await db.execute(
+        delete(SessionAnalysis)
+        .where(SessionAnalysis.uid == uid)
+        .returning(SessionAnalysis.id)
+    )
 
-    if db_analysis:
-        await db.delete(db_analysis)
+    if result.first() is not None:
         await db.commit()
         return True
     return False
 
 
-async def get_analyses_by_session_uids(
-    db: AsyncSession, session_uids: list[str]
-) -> list[SessionAnalysis]:
-    """Get session analyses for multiple session UIDs."""
-    stmt = (
+# Rows fetched per round trip when streaming bulk analyses
+BULK_ANALYSIS_YIELD_PER = 50
+
+
+def _analyses_by_session_uids_stmt(session_uids: list[str]):
+    return (
         select(SessionAnalysis)
         .join(SessionAnalysis.session)
         .options(
@@ -203,7 +187,13 @@ async def get_analyses_by_session_uids(
         .where(CounselingSession.uid.in_(session_uids))
         .order_by(desc(CounselingSession.id))
     )
-    result = await db.execute(stmt)
+
+
+async def get_analyses_by_session_uids(
+    db: AsyncSession, session_uids: list[str]
+) -> list[SessionAnalysis]:
+    """Get session analyses for multiple session UIDs."""
+    result = await db.execute(_analyses_by_session_uids_stmt(session_uids))
     return list(result.scalars().all())
 
 
@@ -272,18 +262,25 @@ async def get_limited_analyses_by_session_uids(
     db: AsyncSession, session_uids: list[str]
 ) -> list[SessionAnalysisBulkItem]:
     """Get limited session analyses data for multiple session UIDs."""
-    # Get full data first
-    full_analyses = await get_analyses_by_session_uids(db, session_uids)
+    # Stream the full rows in batches and keep only the summary of each, so the
+    # video/audio JSON of every requested session is never in memory at once
+    result = await db.stream_scalars(
+        _analyses_by_session_uids_stmt(session_uids).execution_options(
+            yield_per=BULK_ANALYSIS_YIELD_PER
+        )
+    )
 
     # Transform to limited format
     limited_analyses = []
-    for analysis in full_analyses:
+    async for analysis in result:
         try:
             limited_data = _extract_limited_data(analysis)
             limited_analyses.append(limited_data)
         except Exception as e:
             # Log error but continue with other analyses
-            print(f"Error processing analysis for session {analysis.session.uid}: {e}")
+            logger.warning(
+                "Error processing analysis for session %s: %s", analysis.session.uid, e
+            )
             continue
 
     return limited_analyses
@@ -357,7 +354,7 @@ async def get_analysis_by_session_uid_with_status(
 
     except Exception as e:
         # Log error and return default response
-        print(f"Error getting analysis for session {session_uid}: {e}")
+        logger.warning("Error getting analysis for session %s: %s", session_uid, e)
         return SessionAnalysisWithStatusResponse(
             status="PENDING",
             uid=None,
@@ -2,71 +2,219 @@ import logging
 import json
 from uuid import UUID
 
-from sqlalchemy import desc
-from app.service.session_analysis_service import create_or_update_session_analysis
-from app.schemas.session_analysis_schema import SessionAnalysisCreate
-from app.service.video_processing.video_processing import VideoProcessor
+from typing import Optional
+
+from sqlalchemy import (
+    String,
+    bindparam,
+    cast,
+    delete,
+    desc,
+    func,
+    insert,
+    literal,
+    update,
+)
 
 # from service.video_processing.video_processing import VideoProcessor
-from app.service.audio_processing.deepgram_transcriber import DeepgramTranscriber
-from app.service.course_verification.course_verifier import CourseVerifier
-from app.service.raw_transcript_service import create_raw_transcript
-from app.schemas.raw_transcript_schema import RawTranscriptCreate
-from app.service.video_processing.video_extraction import VideoExtractor
+from app.service.counselor_service import get_counselor_ref
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from sqlalchemy.future import select
 from sqlalchemy.exc import SQLAlchemyError
 from fastapi import HTTPException
-from sqlalchemy.orm import joinedload
+from sqlalchemy.orm import aliased
 
 from app.models.session import CounselingSession
 from app.models.counselor import Counselor
+from app.models.session_analysis import SessionAnalysis
 from app.schemas.session_schema import (
     SessionCreate,
     SessionUpdate,
     SessionResponse,
     CounselorInfo,
 )
-from app.exceptions.custom_exception import BaseAppException, NotFoundException
+from app.exceptions.custom_exception import (
+    BadRequestException,
+    BaseAppException,
+    NotFoundException,
+)
 from app.config.log_config import get_logger
 
 logger = get_logger("session_service")
 
+# Columns handed back by INSERT ... RETURNING for new sessions
+_SESSION_RETURNING = (
+    CounselingSession.uid,
+    CounselingSession.description,
+    CounselingSession.session_date,
+    CounselingSession.recording_link,
+)
+
+# Analysis status resolved in SQL; sessions without an analysis row are PENDING
+_ANALYSIS_STATUS = func.coalesce(
+    cast(SessionAnalysis.status, String), literal("PENDING")
+).label("status")
+
+
+def _select_sessions():
+    """
+    Select just the columns a SessionResponse is built from, as plain rows.
+
+    No ORM entities are loaded, so there is no identity map or relationship
+    loading on the read paths.
+    """
+    return (
+        select(
+            *_SESSION_RETURNING,
+            Counselor.uid.label("counselor_uid"),
+            Counselor.name.label("counselor_name"),
+            _ANALYSIS_STATUS,
+        )
+        .select_from(CounselingSession)
+        .join(Counselor, Counselor.id == CounselingSession.counselor_id)
+        .outerjoin(
+            SessionAnalysis, SessionAnalysis.session_id == CounselingSession.id
+        )
+    )
+
+
+# Read statements are built once at import and executed with bound
+# parameters, so requests reuse the same statement and its compiled SQL
+_GET_SESSION_BY_UID = _select_sessions().where(
+    CounselingSession.uid == bindparam("session_uid")
+)
+_COUNT_SESSIONS = select(func.count()).select_from(CounselingSession)
+# Counselor id and their session count in one round trip; no row means the
+# counselor doesn't exist
+_COUNSELOR_SESSION_COUNT = select(
+    Counselor.id,
+    _COUNT_SESSIONS.where(CounselingSession.counselor_id == Counselor.id)
+    .correlate(Counselor)
+    .scalar_subquery()
+    .label("total"),
+).where(Counselor.uid == bindparam("counselor_uid"))
+_SESSIONS = (
+    _select_sessions()
+    .order_by(desc(CounselingSession.id))
+    .limit(bindparam("limit"))
+)
+_SESSIONS_BY_COUNSELOR = _SESSIONS.where(
+    CounselingSession.counselor_id == bindparam("counselor_id")
+)
+# Keyset page: sessions older than the one whose uid is passed as the cursor
+_cursor_session = aliased(CounselingSession)
+_AFTER_CURSOR = (
+    CounselingSession.id
+    < select(_cursor_session.id)
+    .where(_cursor_session.uid == bindparam("cursor"))
+    .scalar_subquery()
+)
+_CURSOR_EXISTS = select(CounselingSession.id).where(
+    CounselingSession.uid == bindparam("cursor")
+)
+_LIST_SESSIONS = _SESSIONS.offset(bindparam("skip"))
+_LIST_SESSIONS_AFTER = _SESSIONS.where(_AFTER_CURSOR)
+_LIST_SESSIONS_BY_COUNSELOR = _SESSIONS_BY_COUNSELOR.offset(bindparam("skip"))
+_LIST_SESSIONS_BY_COUNSELOR_AFTER = _SESSIONS_BY_COUNSELOR.where(_AFTER_CURSOR)
+
+
+async def _check_cursor(db: AsyncSession, cursor: UUID) -> None:
+    """
+    An empty keyset page is also what an unknown cursor produces (the id
+    comparison against a NULL subquery matches nothing); tell them apart.
+    """
+    if await db.scalar(_CURSOR_EXISTS, {"cursor": cursor}) is None:
+        raise BadRequestException(details=f"Unknown cursor {cursor}")
+
+
+def _correlated(column, key, parent_key=CounselingSession.counselor_id):
+    """Scalar subquery reading `column` for the counseling_sessions row in scope."""
+    return (
+        select(column)
+        .where(key == parent_key)
+        .correlate(CounselingSession)
+        .scalar_subquery()
+    )
+
+
+def _to_response(row) -> SessionResponse:
+    """Build a SessionResponse from a _select_sessions()-shaped row."""
+    return SessionResponse(
+        uid=str(row.uid),
+        description=row.description,
+        session_date=row.session_date,
+        recording_link=row.recording_link,
+        status=row.status,
+        # Values come straight from the DB, so skip re-validating the nested model
+        counselor=CounselorInfo.model_construct(
+            uid=str(row.counselor_uid), name=row.counselor_name
+        ),
+    )
+
+
+def _session_to_dict(row) -> dict:
+    """Plain-dict form of SessionResponse for the list endpoints (no Pydantic pass)."""
+    return {
+        "uid": str(row.uid),
+        "description": row.description,
+        "session_date": row.session_date,
+        "recording_link": row.recording_link,
+        "status": row.status,
+        "counselor": {
+            "uid": str(row.counselor_uid),
+            "name": row.counselor_name,
+        },
+    }
+
 
 async def create_session(
     db: AsyncSession, session_in: SessionCreate
 ) -> SessionResponse:
     try:
-        # 1. Find counselor by UID
+        # Resolve the counselor and insert in one statement:
+        # INSERT ... SELECT FROM counselors ... RETURNING
+        counselor_filter = Counselor.uid == session_in.counselor_uid
         result = await db.execute(
-            select(Counselor).where(Counselor.uid == session_in.counselor_uid)
+            insert(CounselingSession)
+            .from_select(
+                ["counselor_id", "description", "session_date", "recording_link"],
+                select(
+                    Counselor.id,
+                    literal(session_in.description, CounselingSession.description.type),
+                    literal(session_in.session_date, CounselingSession.session_date.type),
+                    literal(
+                        str(session_in.recording_link),
+                        CounselingSession.recording_link.type,
+                    ),
+                ).where(counselor_filter),
+            )
+            .returning(
+                *_SESSION_RETURNING,
+                select(Counselor.name)
+                .where(counselor_filter)
+                .scalar_subquery()
+                .label("counselor_name"),
+            )
         )
-        counselor = result.scalar_one_or_none()
+        new_session = result.first()
 
-        if not counselor:
+        # No row inserted means the counselor SELECT matched nothing
+        if new_session is None:
             raise NotFoundException(details="Counselor not found")
 
-        # 2. Create new session with counselor_id
-        new_session = CounselingSession(
-            counselor_id=counselor.id,
-            description=session_in.description,
-            session_date=session_in.session_date,
-            recording_link=str(session_in.recording_link),
-        )
-
-        db.add(new_session)
         await db.commit()
-        await db.refresh(new_session)
 
-        # 3. Return response with counselor info
+        # Return response with counselor info
         return SessionResponse(
             uid=str(new_session.uid),
             description=new_session.description,
             session_date=new_session.session_date,
             recording_link=new_session.recording_link,
             status="PENDING",  # New sessions start as PENDING
-            counselor=CounselorInfo(uid=str(counselor.uid), name=counselor.name),
+            counselor=CounselorInfo(
+                uid=str(session_in.counselor_uid), name=new_session.counselor_name
+            ),
         )
 
     except SQLAlchemyError as e:
@@ -80,35 +228,12 @@ async def create_session(
 
 async def get_session_by_id(db: AsyncSession, session_uid: UUID) -> SessionResponse:
     try:
-        result = await db.execute(
-            select(CounselingSession)
-            .options(joinedload(CounselingSession.counselor))
-            .options(joinedload(CounselingSession.analysis))
-            .filter(CounselingSession.uid == session_uid)
-        )
-        session = result.scalars().first()
-        if not session:
+        result = await db.execute(_GET_SESSION_BY_UID, {"session_uid": session_uid})
+        row = result.first()
+        if not row:
             raise NotFoundException(details=f"Session {session_uid} not found")
 
-        # Get analysis status
-        status = "PENDING"  # Default status
-        if session.analysis and hasattr(session.analysis, "status"):
-            status = (
-                session.analysis.status.value
-                if hasattr(session.analysis.status, "value")
-                else str(session.analysis.status)
-            )
-
-        return SessionResponse(
-            uid=str(session.uid),
-            description=session.description,
-            session_date=session.session_date,
-            recording_link=session.recording_link,
-            status=status,
-            counselor=CounselorInfo(
-                uid=str(session.counselor.uid), name=session.counselor.name
-            ),
-        )
+        return _to_response(row)
     except SQLAlchemyError as e:
         raise BaseAppException(
             error="Database Error",
@@ -120,25 +245,12 @@ async def get_session_by_id(db: AsyncSession, session_uid: UUID) -> SessionRespo
 # for the use of celery (sync version)
 def get_session_by_id_sync(db: Session, session_uid: UUID) -> SessionResponse:
     try:
-        result = db.execute(
-            select(CounselingSession)
-            .options(joinedload(CounselingSession.counselor))
-            .filter(CounselingSession.uid == session_uid)
-        )
-        session = result.scalars().first()
-        if not session:
+        result = db.execute(_GET_SESSION_BY_UID, {"session_uid": session_uid})
+        row = result.first()
+        if not row:
             raise NotFoundException(details=f"Session {session_uid} not found")
 
-        return SessionResponse(
-            uid=str(session.uid),
-            description=session.description,
-            session_date=session.session_date,
-            recording_link=session.recording_link,
-            status="PENDING",  # Default for sync version
-            counselor=CounselorInfo(
-                uid=str(session.counselor.uid), name=session.counselor.name
-            ),
-        )
+        return _to_response(row)
     except SQLAlchemyError as e:
         raise BaseAppException(
             error="Database Error",
@@ -148,64 +260,49 @@ def get_session_by_id_sync(db: Session, session_uid: UUID) -> SessionResponse:
 
 
 async def get_sessions_by_counselor(
-    db: AsyncSession, counselor_uid: str, skip: int = 0, limit: int = 10
+    db: AsyncSession,
+    counselor_uid: str,
+    skip: int = 0,
+    limit: int = 10,
+    cursor: Optional[UUID] = None,
 ):
+    """
+    Page through a counselor's sessions, newest first.
+
+    Pass the uid of the last session seen as `cursor` to fetch the next page
+    by keyset (index seek) instead of OFFSET; `skip` is ignored then.
+    """
     try:
-        # First get the counselor ID
-        counselor_result = await db.execute(
-            select(Counselor).filter(Counselor.uid == counselor_uid)
-        )
-        counselor = counselor_result.scalar_one_or_none()
+        # Resolve the counselor and count their sessions together
+        counselor = (
+            await db.execute(
+                _COUNSELOR_SESSION_COUNT, {"counselor_uid": counselor_uid}
+            )
+        ).first()
 
         if not counselor:
             raise NotFoundException(details=f"Counselor {counselor_uid} not found")
-
-        # Get total count of sessions for this counselor
-        total_result = await db.execute(
-            select(CounselingSession).filter(
-                CounselingSession.counselor_id == counselor.id
-            )
-        )
-        total = len(total_result.scalars().all())
+        total = counselor.total
+        if not total:
+            return [], 0
 
         # Fetch paginated sessions
-        result = await db.execute(
-            select(CounselingSession)
-            .options(joinedload(CounselingSession.counselor))
-            .options(joinedload(CounselingSession.analysis))
-            .filter(CounselingSession.counselor_id == counselor.id)
-            .order_by(desc(CounselingSession.id))
-            .offset(skip)
-            .limit(limit)
-        )
-        sessions = result.scalars().all()
-
-        # Format the response
-        items = []
-        for session in sessions:
-            # Get analysis status
-            status = "PENDING"  # Default status
-            if session.analysis and hasattr(session.analysis, "status"):
-                status = (
-                    session.analysis.status.value
-                    if hasattr(session.analysis.status, "value")
-                    else str(session.analysis.status)
-                )
-
-            items.append(
-                SessionResponse(
-                    uid=str(session.uid),
-                    description=session.description,
-                    session_date=session.session_date,
-                    recording_link=session.recording_link,
-                    status=status,
-                    counselor=CounselorInfo(
-                        uid=str(session.counselor.uid),
-                        name=session.counselor.name,
-                    ),
-                )
+        if cursor:
+            result = await db.execute(
+                _LIST_SESSIONS_BY_COUNSELOR_AFTER,
+                {"counselor_id": counselor.id, "cursor": cursor, "limit": limit},
+            )
+        else:
+            result = await db.execute(
+                _LIST_SESSIONS_BY_COUNSELOR,
+                {"counselor_id": counselor.id, "skip": skip, "limit": limit},
             )
 
+        # Shape rows like SessionResponse; the route serializes them with orjson
+        items = [_session_to_dict(row) for row in result]
+        if cursor and not items:
+            await _check_cursor(db, cursor)
+
         return items, total
 
     except SQLAlchemyError as e:
@@ -216,48 +313,33 @@ async def get_sessions_by_counselor(
         )
 
 
-async def get_all_sessions(db: AsyncSession, skip: int = 0, limit: int = 10):
+async def get_all_sessions(
+    db: AsyncSession, skip: int = 0, limit: int = 10, cursor: Optional[UUID] = None
+):
+    """
+    Page through all sessions, newest first.
+
+    Pass the uid of the last session seen as `cursor` to fetch the next page
+    by keyset instead of OFFSET; `skip` is ignored then.
+    """
     try:
         # Get total count
-        total_result = await db.execute(select(CounselingSession))
-        total = len(total_result.scalars().all())
+        total = await db.scalar(_COUNT_SESSIONS)
 
-        # Fetch paginated sessions with their counselors and analysis
-        result = await db.execute(
-            select(CounselingSession)
-            .options(joinedload(CounselingSession.counselor))
-            .order_by(desc(CounselingSession.id))
-            .options(joinedload(CounselingSession.analysis))
-            .offset(skip)
-            .limit(limit)
-        )
-        sessions = result.scalars().all()
-
-        # Format the response
-        items = []
-        for session in sessions:
-            # Get analysis status
-            status = "PENDING"  # Default status
-            if session.analysis and hasattr(session.analysis, "status"):
-                status = (
-                    session.analysis.status.value
-                    if hasattr(session.analysis.status, "value")
-                    else str(session.analysis.status)
-                )
-
-            items.append(
-                SessionResponse(
-                    uid=str(session.uid),
-                    description=session.description,
-                    session_date=session.session_date,
-                    recording_link=session.recording_link,
-                    status=status,
-                    counselor=CounselorInfo(
-                        uid=str(session.counselor.uid),
-                        name=session.counselor.name,
-                    ),
-                )
+        # Fetch paginated sessions with their counselors and analysis status
+        if cursor:
+            result = await db.execute(
+                _LIST_SESSIONS_AFTER, {"cursor": cursor, "limit": limit}
             )
+        else:
+            result = await db.execute(
+                _LIST_SESSIONS, {"skip": skip, "limit": limit}
+            )
+
+        # Shape rows like SessionResponse; the route serializes them with orjson
+        items = [_session_to_dict(row) for row in result]
+        if cursor and not items:
+            await _check_cursor(db, cursor)
 
         return items, total
 
@@ -272,47 +354,47 @@ async def get_all_sessions(db: AsyncSession, skip: int = 0, limit: int = 10):
 async def update_session(
     db: AsyncSession, session_uid: str, session_in: SessionUpdate
 ) -> SessionResponse:
-    # Get session with counselor and analysis eagerly loaded
-    result = await db.execute(
-        select(CounselingSession)
-        .options(joinedload(CounselingSession.counselor))
-        .options(joinedload(CounselingSession.analysis))
-        .filter(CounselingSession.uid == session_uid)
-    )
-    session = result.scalars().first()
-
-    if not session:
-        raise NotFoundException(details=f"Session {session_uid} not found")
-
-    # Apply updates
-    for key, value in session_in.model_dump(exclude_unset=True).items():
-        setattr(session, key, value)
+    values = session_in.model_dump(exclude_unset=True)
+    if not values:
+        return await get_session_by_id(db, session_uid)
+
+    # counselor_uid isn't a column; resolve it to counselor_id
+    counselor_uid = values.pop("counselor_uid", None)
+    if counselor_uid is not None:
+        counselor = await get_counselor_ref(db, counselor_uid)
+        if not counselor:
+            raise NotFoundException(details=f"Counselor {counselor_uid} not found")
+        values["counselor_id"] = counselor.id
+    if values.get("recording_link") is not None:
+        values["recording_link"] = str(values["recording_link"])
 
     try:
-        db.add(session)
-        await db.commit()
-        await db.refresh(session)
-
-        # Get analysis status
-        status = "PENDING"  # Default status
-        if session.analysis and hasattr(session.analysis, "status"):
-            status = (
-                session.analysis.status.value
-                if hasattr(session.analysis.status, "value")
-                else str(session.analysis.status)
+        # Single UPDATE ... RETURNING, with the counselor and analysis status
+        # for the response read through correlated subqueries
+        result = await db.execute(
+            update(CounselingSession)
+            .where(CounselingSession.uid == session_uid)
+            .values(**values)
+            .returning(
+                *_SESSION_RETURNING,
+                _correlated(Counselor.uid, Counselor.id).label("counselor_uid"),
+                _correlated(Counselor.name, Counselor.id).label("counselor_name"),
+                func.coalesce(
+                    _correlated(
+                        cast(SessionAnalysis.status, String),
+                        SessionAnalysis.session_id,
+                        CounselingSession.id,
+                    ),
+                    literal("PENDING"),
+                ).label("status"),
             )
-
-        return SessionResponse(
-            uid=str(session.uid),
-            description=session.description,
-            session_date=session.session_date,
-            recording_link=session.recording_link,
-            status=status,
-            counselor=CounselorInfo(
-                uid=str(session.counselor.uid),
-                name=session.counselor.name,
-            ),
         )
+        row = result.first()
+        if not row:
+            raise NotFoundException(details=f"Session {session_uid} not found")
+        await db.commit()
+
+        return _to_response(row)
 
     except SQLAlchemyError as e:
         await db.rollback()
@@ -324,9 +406,15 @@ async def update_session(
 
 
 async def delete_session(db: AsyncSession, session_uid: str):
-    session = await get_session_by_id(db, UUID(session_uid))
     try:
-        await db.delete(session)
+        # Analysis and transcript rows go with it via ON DELETE CASCADE
+        result = await db.execute(
+            delete(CounselingSession)
+            .where(CounselingSession.uid == session_uid)
+            .returning(CounselingSession.id)
+        )
+        if result.first() is None:
+            raise NotFoundException(details=f"Session {session_uid} not found")
         await db.commit()
         return {"message": "Session deleted successfully"}
     except SQLAlchemyError as e:
@@ -336,108 +424,3 @@ async def delete_session(db: AsyncSession, session_uid: str):
             details=str(e),
             status_code=500,
         )
-
-
-async def process_video_background(db: AsyncSession, session_uid: UUID):
-    """
-    Background task to process video for a counseling session.
-    This function runs asynchronously after session creation.
-    """
-    extraction = None
-    try:
-        print(f"Starting video processing for session {session_uid}")
-        sessionResponse = await get_session_by_id(db, session_uid)
-
-        extraction = VideoExtractor()
-        extraction_data = extraction.get_video_frames_and_audio_paths(
-            str(sessionResponse.recording_link)
-        )
-
-        # Initialize video processor
-        video_processor = VideoProcessor()
-        video_analysis_data = await video_processor.analyze_video(extraction_data)
-
-        audio_path = extraction_data.get("audio_path")
-        transcript_data = None
-
-        # If transcription wasn't already done in video processing, do it here
-        if audio_path:
-            try:
-                print(f"Starting Deepgram transcription for audio: {audio_path}")
-                transcriber = DeepgramTranscriber()
-                transcript_data = transcriber.transcribe_chunk(
-                    audio_path, str(session_uid)
-                )
-                print(f"Transcription completed successfully")
-
-                # Save transcript to database
-                try:
-                    total_segments = len(transcript_data.get("utterances", []))
-                    transcript_create = RawTranscriptCreate(
-                        session_uid=str(session_uid),
-                        total_segments=total_segments,
-                        raw_transcript=transcript_data,
-                    )
-
-                    saved_transcript = await create_raw_transcript(
-                        db, transcript_create
-                    )
-                    print(
-                        f"Transcript saved to database with UID: {saved_transcript.uid}"
-                    )
-
-                except Exception as db_error:
-                    print(f"Warning: Failed to save transcript to database: {db_error}")
-
-            except Exception as transcription_error:
-                print(f"Warning: Transcription failed: {transcription_error}")
-
-        print(f"Video processing completed for session {session_uid}")
-
-        # Verify course information if transcription was successful
-        if transcript_data:
-            try:
-                print(f"Starting course verification for session {session_uid}")
-
-                # Use transcript data directly instead of loading from file
-                # Initialize course verifier
-                verifier = CourseVerifier()
-
-                # Verify course information
-                audio_analysis_data = verifier.verify_full_transcript(transcript_data)
-
-                # Create or update session analysis with proper data format
-                session_analysis_create = SessionAnalysisCreate(
-                    session_uid=str(session_uid),
-                    video_analysis_data=video_analysis_data,
-                    audio_analysis_data=audio_analysis_data,
-                )
-
-                saved_analysis = await create_or_update_session_analysis(
-                    db, session_analysis_create
-                )
-                print(f"Session analysis saved/updated with UID: {saved_analysis.uid}")
-
-            except Exception as verification_error:
-                print(f"Warning: Course verification failed: {verification_error}")
-
-        return {"msg": "Audio/Video data analyzed successfully"}
-
-        # Here you can add logic to store the results in the database
-        # or send them to another service for further processing
-
-    except Exception as e:
-        logger.error(f"Error processing video for session {session_uid}: {e}")
-        # Background task failure might not need raising API exception
-        # but for consistency:
-        raise BaseAppException(
-            error="Video Processing Error",
-            details=str(e),
-            status_code=500,
-        )
-    finally:
-        try:
-            if extraction:
-                extraction.cleanup()
-        except Exception as cleanup_error:
-            logger.warning(f"Error during cleanup: {cleanup_error}")
@@ -1,69 +1,268 @@
 import os
-import io
+import re
+import subprocess
 import ffmpeg
 import tempfile
 import numpy as np
-import logging
+import threading
+from fractions import Fraction
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from functools import partial
+from functools import lru_cache, partial
 from google.oauth2 import service_account
+from google.auth.transport.requests import AuthorizedSession
 from googleapiclient.discovery import build
 from googleapiclient.http import MediaIoBaseDownload
+from app.config.log_config import get_logger
 
-# Configure logging
-logger = logging.getLogger(__name__)
+logger = get_logger("video_processing")
 
 # Define the scopes for Google Drive API access.
 SCOPES = ['https://www.googleapis.com/auth/drive.readonly']
 
+# Drive file id from ".../file/d/<id>/..." or "...?id=<id>" / "...&id=<id>" links
+_FILE_ID_RE = re.compile(r'(?:/file/d/|[?&/]id=)([A-Za-z0-9_-]{10,})')
+
+# Upper bound on frames sampled per video, so work doesn't grow with its length
+MAX_FRAME_SAMPLES = int(os.getenv("MAX_FRAME_SAMPLES", "200"))
+# Frames are scaled down so their longer side is at most this on extraction
+# (face detection and the attire/background check don't need full resolution;
+# the detector's cost grows with pixel count). Applies to portrait videos too
+FRAME_MAX_WIDTH = int(os.getenv("FRAME_MAX_WIDTH", "640"))
+# Batches whose samples average at most this many seconds apart are decoded in
+# one pass with a select filter; sparser ones seek to each sample instead
+SELECT_MAX_GAP = float(os.getenv("FRAME_SELECT_MAX_GAP", "5"))
+# Parent directory for per-extraction temp dirs (downloaded video + audio);
+# unset = the system temp dir. Point it at a volume with room for large videos
+VIDEO_TEMP_DIR = os.getenv("VIDEO_TEMP_DIR")
+# In the single-pass select decode, skip decoding frames no other frame
+# references (typically B-frames); a sample then lands on the next decoded
+# frame, at most a frame or two later
+FRAME_SKIP_NONREF = os.getenv("FRAME_SKIP_NONREF", "true").lower() == "true"
+# Drive download chunk size (the client default is 100 MB per request)
+DOWNLOAD_CHUNK_SIZE = int(os.getenv("DOWNLOAD_CHUNK_SIZE", str(8 * 1024 * 1024)))
+DOWNLOAD_RETRIES = int(os.getenv("DOWNLOAD_RETRIES", "3"))
+# Parallel HTTP range requests per download; 1 = single sequential download
+DOWNLOAD_CONNECTIONS = int(os.getenv("DOWNLOAD_CONNECTIONS", "1"))
+# Optional ffmpeg hardware decoder for frame extraction, e.g. "cuda", "vaapi"
+# or "auto" (falls back to software when unavailable); unset = software decode
+FFMPEG_HWACCEL = os.getenv("FFMPEG_HWACCEL")
+# Parallel frame-extraction workers; 0 = one per CPU available to this process
+FRAME_WORKERS = int(os.getenv("FRAME_WORKERS", "0"))
+# Decoder threads per ffmpeg frame process; 0 = split the CPUs between the
+# extraction workers instead of each ffmpeg defaulting to one per core
+FFMPEG_THREADS = int(os.getenv("FFMPEG_THREADS", "0"))
+# Per-sample seeks land on the nearest preceding keyframe instead of decoding
+# up to the exact timestamp; cheaper, but the frame may be a few seconds early
+FFMPEG_FAST_SEEK = os.getenv("FFMPEG_FAST_SEEK", "false").lower() == "true"
+
+
+# Drive client shared by every extractor in the process; building it re-reads
+# credentials.json and loads the discovery document
+_drive_service = None
+_drive_credentials = None
+_drive_service_lock = threading.Lock()
+
+
+def _get_drive_service():
+    """Build the Google Drive client once per process (service account auth)."""
+    global _drive_service, _drive_credentials
+    if _drive_service is None:
+        with _drive_service_lock:
+            if _drive_service is None:
+                if not os.path.exists('credentials.json'):
+                    error_msg = "Service account key file 'credentials.json' not found"
+                    logger.error(error_msg)
+                    raise FileNotFoundError(error_msg)
+
+                # Credentials refresh their own token when it expires
+                creds = service_account.Credentials.from_service_account_file(
+                    'credentials.json',
+                    scopes=SCOPES
+                )
+                logger.info("Successfully loaded service account credentials")
+                _drive_credentials = creds
+
+                # Bundled discovery document, no HTTP fetch
+                _drive_service = build(
+                    'drive', 'v3', credentials=creds,
+                    cache_discovery=False, static_discovery=True
+                )
+                logger.info("Successfully built Google Drive service")
+    return _drive_service
+
+
+def _available_cpus():
+    """CPUs this process may run on (respects affinity/cpusets in containers)."""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+@lru_cache(maxsize=1)
+def _hwaccel():
+    """FFMPEG_HWACCEL if the installed ffmpeg supports it, else None (software decode)."""
+    if not FFMPEG_HWACCEL or FFMPEG_HWACCEL == 'auto':
+        return FFMPEG_HWACCEL
+    try:
+        output = subprocess.run(
+            ['ffmpeg', '-hide_banner', '-hwaccels'], capture_output=True, text=True, timeout=10
+        ).stdout
+    except (OSError, subprocess.SubprocessError) as e:
+        logger.warning(f"Could not list ffmpeg hwaccels, using software decode: {e}")
+        return None
+    # First line is the "Hardware acceleration methods:" header
+    if FFMPEG_HWACCEL not in output.split()[3:]:
+        logger.warning(f"ffmpeg has no '{FFMPEG_HWACCEL}' hwaccel, using software decode")
+        return None
+    return FFMPEG_HWACCEL
+
+
+def _frame_input(video_path, timestamp, threads, fast_seek=False, hwaccel=None, skip_nonref=False):
+    """
+    ffmpeg input seeked to `timestamp`, hardware-decoded if `hwaccel` is set.
+    Input kwargs are emitted before -i, so this is an input (demuxer) seek.
+    """
+    kwargs = {'ss': timestamp, 'threads': threads}
+    if fast_seek:
+        kwargs['noaccurate_seek'] = None
+    if skip_nonref:
+        kwargs['skip_frame'] = 'noref'
+    if hwaccel:
+        kwargs['hwaccel'] = hwaccel
+    return ffmpeg.input(video_path, **kwargs)
+
+def _plan_batches(timestamps, max_workers):
+    """
+    Group sorted timestamps so each batch is either a run of closely spaced
+    samples (one select-filter decode) or a stretch of sparse ones (one seek
+    each), never a mix; long groups are cut so every worker gets a share.
+    """
+    groups = []
+    for timestamp in timestamps:
+        if groups and timestamp - groups[-1][-1] <= SELECT_MAX_GAP:
+            groups[-1].append(timestamp)
+        else:
+            groups.append([timestamp])
+
+    # Consecutive lone samples are the sparse stretch; seek them together
+    merged = []
+    for group in groups:
+        if len(group) == 1 and merged and merged[-1][1]:
+            merged[-1][0].extend(group)
+        else:
+            merged.append((group, len(group) == 1))
+
+    max_len = max(1, -(-len(timestamps) // max_workers))
+    return [
+        group[i:i + max_len]
+        for group, _ in merged
+        for i in range(0, len(group), max_len)
+    ]
+
+def _read_rawvideo(stream, out):
+    """
+    Run an ffmpeg rawvideo-to-pipe command, reading its stdout straight into
+    the preallocated uint8 array `out` (no intermediate bytes object).
+    Returns the number of bytes read; fewer than out.nbytes means short output.
+    """
+    view = memoryview(out.reshape(-1))
+    # Unbuffered pipe: readinto() goes straight from the fd into `out`
+    # without passing through a BufferedReader's internal buffer
+    process = subprocess.Popen(
+        ffmpeg.compile(stream), stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, bufsize=0
+    )
+    read = 0
+    try:
+        while read < len(view):
+            n = process.stdout.readinto(view[read:])
+            if not n:
+                break
+            read += n
+    finally:
+        process.stdout.close()
+        process.wait()
+    return read
+
 class VideoExtractor:
     """
     Optimized video extractor with parallel processing and smart sampling.
     """
     
-    def __init__(self, max_workers=4):
+    def __init__(self, max_workers=None, temp_root=VIDEO_TEMP_DIR):
         """Initialize the video extractor with configurable parallelism"""
         logger.info("Initializing OptimizedVideoExtractor")
         self.service = None
-        self.temp_dir = tempfile.mkdtemp()
-        self.max_workers = max_workers
+        # Removed by cleanup(), or by the finalizer (on GC or at interpreter
+        # exit) if this is never called
+        self._temp_dir = tempfile.TemporaryDirectory(prefix='video_', dir=temp_root)
+        self.temp_dir = self._temp_dir.name
+        cpus = _available_cpus()
+        self.max_workers = max_workers or FRAME_WORKERS or cpus
+        self.native_size = None  # (width, height) of the video being processed
+        self.ffmpeg_threads = FFMPEG_THREADS or max(1, cpus // self.max_workers)
         logger.debug(f"Created temporary directory: {self.temp_dir}")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.cleanup()
         
+    def _scale_kwargs(self, width, height):
+        """ffmpeg -s only when frames are downscaled; at native size it's a no-op scale."""
+        if (width, height) == self.native_size:
+            return {}
+        return {'s': f'{width}x{height}'}
+
     def get_drive_service(self):
         """Handles the Google Drive API authentication using service account."""
         try:
-            if os.path.exists('credentials.json'):
-                creds = service_account.Credentials.from_service_account_file(
-                    'credentials.json',
-                    scopes=SCOPES
-                )
-                logger.info("Successfully loaded service account credentials")
-            else:
-                error_msg = "Service account key file 'credentials.json' not found"
-                logger.error(error_msg)
-                raise FileNotFoundError(error_msg)
-
-            self.service = build('drive', 'v3', credentials=creds)
-            logger.info("Successfully built Google Drive service")
+            self.service = _get_drive_service()
             return self.service
 
         except Exception as e:
             logger.error(f"Error setting up Google Drive service: {e}")
             raise Exception(f"Failed to authenticate with Google Drive: {str(e)}")
 
-    def _extract_single_frame(self, temp_video_path, timestamp, width, height):
-        """Extract a single frame at the given timestamp."""
+    def _download_ranges(self, uri, path, size):
+        """
+        Download `size` bytes from `uri` over DOWNLOAD_CONNECTIONS parallel
+        Range requests, each writing its slice of the preallocated file.
+        """
+        part = max(1, -(-size // DOWNLOAD_CONNECTIONS))
+        with open(path, 'wb') as f:
+            f.truncate(size)
+
+        def fetch(start):
+            end = min(start + part, size) - 1
+            # One session per range; requests sessions aren't shared across threads
+            session = AuthorizedSession(_drive_credentials)
+            with session.get(uri, headers={'Range': f'bytes={start}-{end}'}, stream=True, timeout=60) as response, \
+                    open(path, 'r+b') as f:
+                response.raise_for_status()
+                f.seek(start)
+                for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                    f.write(chunk)
+                if f.tell() != end + 1:
+                    raise IOError(f"Range {start}-{end} ended early at byte {f.tell()}")
+
+        with ThreadPoolExecutor(max_workers=DOWNLOAD_CONNECTIONS) as executor:
+            list(executor.map(fetch, range(0, size, part)))
+
+    def _extract_single_frame(self, temp_video_path, timestamp, frame):
+        """
+        Extract a single frame at the given timestamp into the (h, w, 3) array
+        `frame`. This is the fallback path, so it always decodes in software.
+        """
         try:
-            frame_data, _ = (
-                ffmpeg
-                .input(temp_video_path, ss=timestamp)
-                .output('pipe:', format='rawvideo', pix_fmt='bgr24', vframes=1, s=f'{width}x{height}')
-                .run(capture_stdout=True, quiet=True)
+            height, width, _ = frame.shape
+            stream = (
+                _frame_input(temp_video_path, timestamp, self.ffmpeg_threads, fast_seek=FFMPEG_FAST_SEEK)
+                .output('pipe:', format='rawvideo', pix_fmt='bgr24', vframes=1, **self._scale_kwargs(width, height))
             )
 
-            if frame_data:
-                frame_array = np.frombuffer(frame_data, np.uint8)
-                frame = frame_array.reshape((height, width, 3))
+            if _read_rawvideo(stream, frame) == frame.nbytes:
                 return timestamp, frame
             else:
                 return timestamp, None
@@ -72,78 +271,104 @@ class VideoExtractor:
             logger.warning(f"Failed to extract frame at {timestamp}s: {e}")
             return timestamp, None
 
-    def _extract_frames_batch(self, temp_video_path, timestamps, width, height, batch_size=10):
-        """Extract multiple frames in a single ffmpeg call for efficiency."""
+    def _extract_frames_select(self, temp_video_path, timestamps, out):
+        """
+        Decode [first, last] timestamp once, keeping only the sampled frames
+        via a select filter: for each timestamp, the first frame at or after
+        it (by frame time, so variable frame rate videos line up too).
+        """
+        # Needs an accurate seek: frame times count from exactly `start`.
+        # prev_t is NAN on the first frame, hence not(gte(..)) over lt(..)
+        start = timestamps[0]
+        expr = '+'.join(f'gte(t,{t - start})*not(gte(prev_t,{t - start}))' for t in timestamps)
+        _, height, width, _ = out.shape
+        stream = (
+            _frame_input(temp_video_path, start, self.ffmpeg_threads, hwaccel=_hwaccel(), skip_nonref=FRAME_SKIP_NONREF)
+            .output('pipe:', vf=f"select='{expr}'", vsync='passthrough', vframes=len(timestamps),
+                    format='rawvideo', pix_fmt='bgr24', **self._scale_kwargs(width, height))
+        )
+        return _read_rawvideo(stream, out)
+
+    def _extract_frames_seek(self, temp_video_path, timestamps, out):
+        """
+        One seeked input per timestamp, first frame of each, concatenated onto
+        one rawvideo pipe.
+        """
+        segments = [
+            _frame_input(
+                temp_video_path, timestamp, self.ffmpeg_threads, fast_seek=FFMPEG_FAST_SEEK, hwaccel=_hwaccel()
+            ).video.trim(end_frame=1)
+            for timestamp in timestamps
+        ]
+        _, height, width, _ = out.shape
+        stream = (
+            ffmpeg.concat(*segments, v=1, a=0)
+            .output('pipe:', format='rawvideo', pix_fmt='bgr24', **self._scale_kwargs(width, height))
+        )
+        return _read_rawvideo(stream, out)
+
+    def _extract_frames_batch(self, temp_video_path, timestamps, out):
+        """
+        Extract a batch of frames into `out` (one (h, w, 3) slot per timestamp)
+        with a single ffmpeg process: a single decode pass for closely spaced
+        samples, one seek per sample otherwise.
+        """
         try:
-            # Create filter for multiple timestamps
-            filter_complex = []
-            outputs = []
-            
-            for i, timestamp in enumerate(timestamps):
-                filter_complex.append(f'[0:v]trim=start={timestamp}:duration=0.04,setpts=PTS-STARTPTS[v{i}]')
-                outputs.append(f'[v{i}]')
-            
-            if not filter_complex:
-                return {}
-            
-            # Build ffmpeg command
-            input_stream = ffmpeg.input(temp_video_path)
-            
-            # For small batches, use the single frame approach which is more reliable
-            if len(timestamps) <= 3:
-                frames = {}
-                for timestamp in timestamps:
-                    try:
-                        frame_data, _ = (
-                            ffmpeg
-                            .input(temp_video_path, ss=timestamp)
-                            .output('pipe:', format='rawvideo', pix_fmt='bgr24', vframes=1, s=f'{width}x{height}')
-                            .run(capture_stdout=True, quiet=True)
-                        )
-                        if frame_data:
-                            frame_array = np.frombuffer(frame_data, np.uint8)
-                            frame = frame_array.reshape((height, width, 3))
-                            frames[timestamp] = frame
-                        else:
-                            frames[timestamp] = None
-                    except Exception as e:
-                        logger.warning(f"Failed to extract frame at {timestamp}s: {e}")
-                        frames[timestamp] = None
-                return frames
+            if len(timestamps) > 1 and (timestamps[-1] - timestamps[0]) / (len(timestamps) - 1) <= SELECT_MAX_GAP:
+                read = self._extract_frames_select(temp_video_path, timestamps, out)
             else:
-                # For larger batches, fall back to individual extraction
-                frames = {}
-                for timestamp in timestamps:
-                    _, frame = self._extract_single_frame(temp_video_path, timestamp, width, height)
-                    frames[timestamp] = frame
-                return frames
-                
+                read = self._extract_frames_seek(temp_video_path, timestamps, out)
+
+            # A sample past the last decodable frame yields nothing, which would
+            # misalign the frames; only trust the output when every one is there
+            if read == out.nbytes:
+                return dict(zip(timestamps, out))
+
+            logger.debug(f"Batch returned incomplete output, extracting {len(timestamps)} frames individually")
         except Exception as e:
             logger.warning(f"Batch extraction failed, falling back to individual: {e}")
-            # Fallback to individual extraction
-            frames = {}
-            for timestamp in timestamps:
-                _, frame = self._extract_single_frame(temp_video_path, timestamp, width, height)
-                frames[timestamp] = frame
-            return frames
 
-    def get_video_frames_and_audio_paths(self, video_url: str, smart_sampling=True):
+        frames = {}
+        for timestamp, frame in zip(timestamps, out):
+            _, frame = self._extract_single_frame(temp_video_path, timestamp, frame)
+            frames[timestamp] = frame
+        return frames
+
+    def _extract_audio(self, temp_video_path, audio_path):
+        """
+        Extract 16 kHz mono audio for transcription, FLAC-compressed: lossless,
+        but about half the bytes of the PCM WAV to write and upload to Deepgram.
+        """
+        logger.info("Extracting audio")
+
+        # Map only the audio stream (-vn) so no video decoder is set up
+        stream = ffmpeg.input(temp_video_path).audio
+        stream = ffmpeg.output(stream, audio_path,
+                             acodec='flac',
+                             ar='16000',
+                             ac='1',
+                             vn=None)
+
+        ffmpeg.run(stream, overwrite_output=True, quiet=True)
+        logger.info(f"Audio extracted to: {audio_path}")
+
+    def get_video_frames_and_audio_paths(self, video_url: str, smart_sampling=True, on_audio_ready=None):
         """
         Optimized processing method with parallel extraction and smart sampling.
+        If given, on_audio_ready(audio_path) is called as soon as the audio is
+        extracted, so transcription can start while frames are still decoding.
         """
         try:
             if not self.service:
                 self.get_drive_service()
             
             # Extract file ID from URL
-            if '/file/d/' in video_url:
-                file_id = video_url.split('/file/d/')[1].split('/')[0]
-            elif '/id=' in video_url:
-                file_id = video_url.split('/id=')[1].split('&')[0]
-            else:
+            match = _FILE_ID_RE.search(video_url)
+            if not match:
                 error_msg = "Invalid Google Drive URL format"
                 logger.error(error_msg)
                 raise ValueError(error_msg)
+            file_id = match.group(1)
 
             logger.info(f"Starting optimized video processing for file ID: {file_id}")
             
@@ -151,106 +376,133 @@ class VideoExtractor:
             temp_video = os.path.join(self.temp_dir, 'temp_video.mp4')
             
             request = self.service.files().get_media(fileId=file_id, acknowledgeAbuse=True)
-            file_content = io.BytesIO()
-            downloader = MediaIoBaseDownload(file_content, request)
-            done = False
-            
-            while not done:
-                status, done = downloader.next_chunk()
-                if not done:
-                    progress = int(status.progress() * 100)
-                    if progress % 20 == 0:
-                        logger.info(f"Download progress: {progress}%")
-
-            # Write to file more efficiently
-            file_content.seek(0)
-            with open(temp_video, 'wb') as f:
-                f.write(file_content.getvalue())
-
-            logger.info("Video downloaded, analyzing metadata")
-            
-            # Get video metadata
-            probe = ffmpeg.probe(temp_video)
-            video_info = next(s for s in probe['streams'] if s['codec_type'] == 'video')
-            
-            fps = float(video_info['r_frame_rate'].split('/')[0]) / float(video_info['r_frame_rate'].split('/')[1])
-            duration = float(probe['format']['duration'])
-            width = int(video_info['width'])
-            height = int(video_info['height'])
-            
-            metadata = {
-                'duration': duration,
-                'fps': fps,
-                'width': width,
-                'height': height,
-                'total_frames': int(duration * fps)
-            }
-            
-            logger.info(f"Video metadata: {duration:.1f}s, {fps:.1f} fps, {width}x{height}")
-            
-            # Smart sampling strategy
-            sampling_interval = int(os.getenv("FRAME_SAMPLING_INTERVAL", "60"))
-            
-            if smart_sampling and duration > 60:  # For videos longer than 1 minute
-                # Sample more densely at the beginning and end, sparse in middle
-                start_samples = list(range(0, min(30, int(duration//3)), 2))
-                middle_samples = list(range(30, int(duration*2//3), sampling_interval*2))
-                end_samples = list(range(max(int(duration*2//3), 30), int(duration), 2))
-                timestamps = start_samples + middle_samples + end_samples
-                timestamps = [t for t in timestamps if t < duration]
+            if DOWNLOAD_CONNECTIONS > 1:
+                size = int(self.service.files().get(fileId=file_id, fields='size').execute()['size'])
+                self._download_ranges(request.uri, temp_video, size)
             else:
-                timestamps = list(range(0, int(duration), sampling_interval))
-            
-            # Remove duplicates and sort
-            timestamps = sorted(list(set(timestamps)))
-            
-            logger.info(f"Using smart sampling: {len(timestamps)} frames to extract")
-            
-            # Parallel frame extraction
+                # Stream chunks straight to disk instead of buffering the whole video
+                with open(temp_video, 'wb') as f:
+                    downloader = MediaIoBaseDownload(f, request, chunksize=DOWNLOAD_CHUNK_SIZE)
+                    done = False
+                    last_logged = 0
+
+                    while not done:
+                        # Retries a failed chunk in place rather than failing the whole download
+                        status, done = downloader.next_chunk(num_retries=DOWNLOAD_RETRIES)
+                        if not done:
+                            # Chunks rarely land on exact percentages; log each 10% step once
+                            progress = int(status.progress() * 100)
+                            if progress // 10 > last_logged // 10:
+                                last_logged = progress
+                                logger.debug("Download progress: %d%%", progress)
+
+            # Audio and frame extraction are independent ffmpeg decodes of the
+            # same file, so the audio starts on its own worker as soon as the
+            # download lands and runs alongside the probe and the frames
+            audio_path = os.path.join(self.temp_dir, 'extracted_audio.flac')
             frames = {}
-            if timestamps:
-                logger.info("Starting parallel frame extraction")
-                
-                # Split timestamps into batches for processing
-                batch_size = max(1, len(timestamps) // self.max_workers)
-                timestamp_batches = [timestamps[i:i + batch_size] for i in range(0, len(timestamps), batch_size)]
-                
-                with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-                    # Submit batch jobs
-                    future_to_batch = {
-                        executor.submit(self._extract_frames_batch, temp_video, batch, width, height): batch
-                        for batch in timestamp_batches
-                    }
-                    
+            with ThreadPoolExecutor(max_workers=self.max_workers + 1) as executor:
+                audio_future = executor.submit(self._extract_audio, temp_video, audio_path)
+                if on_audio_ready:
+                    audio_future.add_done_callback(
+                        lambda f: f.exception() is None and on_audio_ready(audio_path)
+                    )
+
+                logger.info("Video downloaded, analyzing metadata")
+
+                # Get video metadata
+                probe = ffmpeg.probe(temp_video)
+                video_info = next(s for s in probe['streams'] if s['codec_type'] == 'video')
+
+                fps = float(Fraction(video_info['r_frame_rate']))
+                duration = float(probe['format']['duration'])
+                width = int(video_info['width'])
+                height = int(video_info['height'])
+
+                metadata = {
+                    'duration': duration,
+                    'fps': fps,
+                    'width': width,
+                    'height': height,
+                    'total_frames': int(duration * fps)
+                }
+
+                logger.info(f"Video metadata: {duration:.1f}s, {fps:.1f} fps, {width}x{height}")
+
+                # Smart sampling strategy
+                sampling_interval = int(os.getenv("FRAME_SAMPLING_INTERVAL", "60"))
+
+                if smart_sampling and duration > 60:  # For videos longer than 1 minute
+                    # Sample more densely at the beginning and end, sparse in middle
+                    start_samples = list(range(0, min(30, int(duration//3)), 2))
+                    middle_samples = list(range(30, int(duration*2//3), sampling_interval*2))
+                    end_samples = list(range(max(int(duration*2//3), 30), int(duration), 2))
+                    timestamps = start_samples + middle_samples + end_samples
+                    timestamps = [t for t in timestamps if t < duration]
+                else:
+                    timestamps = list(range(0, int(duration), sampling_interval))
+
+                # Remove duplicates and sort
+                timestamps = sorted(list(set(timestamps)))
+
+                # Long videos: keep an evenly strided subset of the samples
+                if len(timestamps) > MAX_FRAME_SAMPLES:
+                    stride = len(timestamps) / MAX_FRAME_SAMPLES
+                    timestamps = [timestamps[int(i * stride)] for i in range(MAX_FRAME_SAMPLES)]
+
+                # Decode straight to a smaller frame size
+                # Rotated videos are autorotated on decode, so their output size
+                # differs from the coded one; always pass -s for those
+                rotated = 'rotate' in video_info.get('tags', {}) or any(
+                    'rotation' in side_data for side_data in video_info.get('side_data_list', [])
+                )
+                self.native_size = None if rotated else (width, height)
+                frame_width, frame_height = width, height
+                if max(width, height) > FRAME_MAX_WIDTH:
+                    scale = FRAME_MAX_WIDTH / max(width, height)
+                    frame_width = max(2, int(width * scale) // 2 * 2)
+                    frame_height = max(2, int(height * scale) // 2 * 2)
+
+                logger.info(f"Using smart sampling: {len(timestamps)} frames to extract")
+
+                if timestamps:
+                    logger.info("Starting parallel frame extraction")
+
+                    # Split timestamps into batches for processing
+                    timestamp_batches = _plan_batches(timestamps, self.max_workers)
+
+                    # One contiguous array for every sampled frame; batches are
+                    # consecutive runs of the sorted timestamps, so each worker
+                    # decodes into its own slice of it
+                    all_frames = np.empty((len(timestamps), frame_height, frame_width, 3), np.uint8)
+                    future_to_batch = {}
+                    offset = 0
+                    for batch in timestamp_batches:
+                        out = all_frames[offset:offset + len(batch)]
+                        future_to_batch[executor.submit(self._extract_frames_batch, temp_video, batch, out)] = batch
+                        offset += len(batch)
+
                     completed_frames = 0
                     for future in as_completed(future_to_batch):
                         try:
                             batch_frames = future.result()
                             frames.update(batch_frames)
                             completed_frames += len(batch_frames)
-                            
+
                             if completed_frames % 20 == 0:
                                 logger.info(f"Extracted {completed_frames}/{len(timestamps)} frames")
                         except Exception as e:
                             logger.error(f"Batch processing error: {e}")
-                
-                successful_frames = len([f for f in frames.values() if f is not None])
-                logger.info(f"Parallel frame extraction completed: {successful_frames}/{len(timestamps)} successful")
-            
-            # Extract audio in parallel with frame processing cleanup
-            logger.info("Extracting audio")
-            audio_path = os.path.join(self.temp_dir, 'extracted_audio.wav')
-
-            # Use more efficient audio extraction settings
-            stream = ffmpeg.input(temp_video)
-            stream = ffmpeg.output(stream, audio_path,
-                                 acodec='pcm_s16le',
-                                 ar='16000',
-                                 ac='1',
-                                 preset='ultrafast')  # Faster encoding
-
-            ffmpeg.run(stream, overwrite_output=True, quiet=True)
-            logger.info(f"Audio extracted to: {audio_path}")
+
+                    # Batches finish in any order; hand frames back in chronological
+                    # order so consumers can iterate them without sorting
+                    frames = {t: frames[t] for t in timestamps if t in frames}
+
+                    successful_frames = sum(1 for f in frames.values() if f is not None)
+                    logger.info(f"Parallel frame extraction completed: {successful_frames}/{len(timestamps)} successful")
+
+                # Audio failures are fatal, as before
+                audio_future.result()
             
             # Clean up video file
             if os.path.exists(temp_video):
@@ -268,16 +520,11 @@ class VideoExtractor:
 
     def cleanup(self):
         """Clean up temporary directory and files"""
-        if self.temp_dir and os.path.exists(self.temp_dir):
-            import shutil
+        if self.temp_dir:
             logger.info(f"Cleaning up temporary directory: {self.temp_dir}")
             try:
-                shutil.rmtree(self.temp_dir, ignore_errors=True)
+                self._temp_dir.cleanup()
                 self.temp_dir = None
                 logger.info("Cleanup completed successfully")
             except Exception as e:
                 logger.warning(f"Error during cleanup: {e}")
-
-    def __del__(self):
-        """Cleanup when object is destroyed"""
-        self.cleanup()
\ No newline at end of file
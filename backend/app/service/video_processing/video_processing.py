@@ -4,21 +4,48 @@ import cv2
 import numpy as np
 import os
 import base64
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from deepface import DeepFace
 from datetime import datetime
 from langchain.chat_models import init_chat_model
 from typing import Optional, Dict
-import logging
 from dotenv import load_dotenv
+from app.config.log_config import get_logger
 
 load_dotenv()
 
-# Configure logging
-logger = logging.getLogger(__name__)
+logger = get_logger("video_processing")
 
 # Constants
 MIN_OFF_PERIOD_DURATION = int(os.getenv("MIN_OFF_PERIOD_DURATION", "6"))
-MAX_EMBEDDING_HISTORY = 5  # Number of face images to keep per person
+MAX_EMBEDDING_HISTORY = 5  # Number of face embeddings to keep per person
+# Cosine distance under which two faces are the same person
+# (DeepFace.verify's threshold for its default VGG-Face model)
+FACE_MATCH_THRESHOLD = float(os.getenv("FACE_MATCH_THRESHOLD", "0.68"))
+# Frames whose 64-bit difference hashes differ in fewer bits than this are
+# treated as duplicates and sent to Gemini only once
+VISUAL_DUPLICATE_BITS = int(os.getenv("VISUAL_DUPLICATE_BITS", "5"))
+# Opt-in: consecutive samples whose hashes differ in fewer bits than this reuse
+# the previous sample's face analysis, skipping detection and anti-spoofing
+# (0, the default, analyses every sample)
+REPEATED_FRAME_BITS = int(os.getenv("REPEATED_FRAME_BITS", "0"))
+# At most this many samples in a row reuse a result before a fresh analysis
+REPEATED_FRAME_MAX_REUSE = int(os.getenv("REPEATED_FRAME_MAX_REUSE", "4"))
+# How many frames face detection may run ahead of the embedding/matching loop
+DETECTION_LOOKAHEAD = int(os.getenv("DETECTION_LOOKAHEAD", "4"))
+
+
+def _lookahead_map(executor, fn, items, depth):
+    """Like executor.map, but with at most `depth` calls queued ahead of the consumer"""
+    pending = deque()
+    for item in items:
+        pending.append(executor.submit(fn, item))
+        if len(pending) > depth:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
 
 
 class VideoProcessor:
@@ -36,22 +63,20 @@ class VideoProcessor:
 
         # Person tracking state
         self.next_person_id = 1
-        self.person_embeddings = {}  # person_id -> List[face images] for DeepFace.verify()
+        self.person_embeddings = {}  # person_id -> deque of the latest normalized face embeddings
         self.person_display_images = {}  # person_id -> face image with bounding box for UI
 
         # Pre-load DeepFace models
         try:
             logger.info("Initializing DeepFace models...")
-            # Warm up face detection and recognition using official API
+            # Warm up the same detector/anti-spoofing/recognition models the
+            # analysis uses, so no extra detector is loaded and run here
             dummy_img = np.zeros((224, 224, 3), dtype=np.uint8)
-            _ = DeepFace.extract_faces(
-                img_path=dummy_img,
-                enforce_detection=False
-            )
-            _ = DeepFace.represent(
-                img_path=dummy_img,
-                enforce_detection=False
-            )
+            _, detection_error = self._detect_faces(dummy_img)
+            if detection_error is not None:
+                raise detection_error
+            if self._face_embedding(dummy_img) is None:
+                raise RuntimeError("Face embedding model failed to load")
             logger.info("DeepFace models initialized successfully")
         except Exception as e:
             logger.error(f"Failed to initialize DeepFace: {e}")
@@ -62,8 +87,10 @@ class VideoProcessor:
     def cleanup_resources(self):
         """Clean up video processing resources"""
         try:
-            # Clear person tracking data
+            # Clear person tracking data so the shared instance starts fresh
             self.person_embeddings.clear()
+            self.person_display_images.clear()
+            self.next_person_id = 1
             logger.debug("Video processing resources cleaned up")
         except Exception as e:
             logger.warning(f"Error during cleanup: {e}")
@@ -72,99 +99,116 @@ class VideoProcessor:
         """Cleanup when object is destroyed"""
         self.cleanup_resources()
 
-    def _find_matching_person(self, face_img: np.ndarray) -> Optional[int]:
-        """Find if this face matches any known person using DeepFace verification"""
-        if face_img is None:
-            return None
-            
-        best_match = None
-        lowest_distance = float('inf')
-            
-        for person_id, stored_face_imgs in self.person_embeddings.items():
-            for stored_face in stored_face_imgs:
-                try:
-                    # Use DeepFace.verify for proper face matching
-                    result = DeepFace.verify(
-                        img1_path=face_img,
-                        img2_path=stored_face,
-                        enforce_detection=False
-                    )
-                    
-                    if result["verified"] and result["distance"] < lowest_distance:
-                        lowest_distance = result["distance"]
-                        best_match = person_id
-                        
-                except Exception as e:
-                    logger.debug(f"Face verification error: {e}")
-                    continue
-                    
-        return best_match
-
-    def _format_timestamp(self, timestamp: float) -> str:
-        """Format timestamp as MM:SS"""
-        return f"{int(timestamp//60):02d}:{int(timestamp%60):02d}"
-
-    async def analyze_video(self, video_data: dict):
-
+    def _face_embedding(self, face_img: np.ndarray) -> Optional[np.ndarray]:
+        """L2-normalized DeepFace embedding of an already-cropped face"""
         try:
-            # Extract file ID from Google Drive URL
-            logger.info("Extracting video frames")
-            frames_data = video_data["frames"]
-            audio_path = video_data["audio_path"]
-            metadata = video_data["metadata"]
-
-            fps = metadata["fps"]
-            duration = metadata["duration"]
-            frame_count = metadata["total_frames"]
-
-            logger.info(
-                f"Video metadata: {duration:.1f}s, {fps:.1f} fps, {frame_count} frames"
-            )
-
-            # Analyze camera status using extracted frames
-            logger.info("Starting camera status analysis")
-            camera_analysis = self.analyze_camera_status_from_frames(
-                frames_data, duration, fps
+            result = DeepFace.represent(
+                img_path=face_img,
+                detector_backend="skip",
+                enforce_detection=False,
             )
+            embedding = np.asarray(result[0]["embedding"], dtype=np.float32)
+            return embedding / (np.linalg.norm(embedding) or 1.0)
+        except Exception as e:
+            logger.debug(f"Face embedding error: {e}")
+            return None
 
-            # Check if camera analysis was successful
-            if not camera_analysis.get("success", False):
-                error_msg = f"Camera analysis failed: {camera_analysis.get('error', 'Unknown error')}"
-                logger.error(error_msg)
-                raise Exception(error_msg)
+    def _stored_embeddings(self):
+        """
+        Stack every stored embedding into one matrix, returning
+        (person_ids, matrix) with one row per embedding, or None if empty.
+        """
+        person_ids = []
+        stored = []
+        for person_id, embeddings in self.person_embeddings.items():
+            person_ids.extend([person_id] * len(embeddings))
+            stored.extend(embeddings)
+        if not stored:
+            return None
+        return np.array(person_ids), np.stack(stored)
 
-            logger.info("Camera analysis completed successfully")
+    def _assign_persons(self, embeddings):
+        """
+        Match the face embeddings of one frame to known persons.
 
-            # Perform visual intelligence analysis
-            logger.info("Starting visual intelligence analysis")
-            attireAndBackgroundAnalysis = self._perform_visual_analysis_from_frames(
-                frames_data, camera_analysis["detailed_results"]["camera_timeline"]
+        Each face gets the person with its closest stored embedding, if within
+        FACE_MATCH_THRESHOLD; closest face/person pairs are assigned first and
+        each person at most once, so two faces in a frame never share a person
+        regardless of detection order. Returns a person_id or None per face.
+        """
+        assigned = [None] * len(embeddings)
+        faces = [i for i, embedding in enumerate(embeddings) if embedding is not None]
+        known = self._stored_embeddings()
+        if not faces or known is None:
+            return assigned
+
+        # One matrix product against every stored embedding instead of a
+        # DeepFace.verify() call (two model passes) per face and stored face
+        person_ids, matrix = known
+        distances = 1.0 - np.stack([embeddings[i] for i in faces]) @ matrix.T
+        persons, columns = np.unique(person_ids, return_inverse=True)
+        per_person = np.stack(
+            [distances[:, columns == k].min(axis=1) for k in range(len(persons))], axis=1
+        )
+
+        used = set()
+        for flat in np.argsort(per_person, axis=None):
+            face, k = divmod(int(flat), len(persons))
+            if per_person[face, k] > FACE_MATCH_THRESHOLD:
+                break
+            if assigned[faces[face]] is None and k not in used:
+                assigned[faces[face]] = int(persons[k])
+                used.add(k)
+        return assigned
+
+    def _repeated_frames(self, frames):
+        """
+        Flag each frame whose difference hash is within REPEATED_FRAME_BITS of
+        the last unflagged frame, i.e. a sample of the same, unchanged shot.
+        No more than REPEATED_FRAME_MAX_REUSE frames in a row are flagged.
+        """
+        if REPEATED_FRAME_BITS <= 0:
+            return [False] * len(frames)
+
+        repeats = []
+        last_hash = None
+        reused = 0
+        for frame in frames:
+            frame_hash = self._dhash(frame) if frame is not None else None
+            repeat = (
+                frame_hash is not None
+                and last_hash is not None
+                and reused < REPEATED_FRAME_MAX_REUSE
+                and bin(frame_hash ^ last_hash).count("1") < REPEATED_FRAME_BITS
             )
+            if repeat:
+                reused += 1
+            else:
+                last_hash = frame_hash
+                reused = 0
+            repeats.append(repeat)
+        return repeats
 
-            video_response = VideoResponse()
-            results = video_response._format_ui_friendly_results(
-                camera_analysis, attireAndBackgroundAnalysis, metadata, audio_path
+    def _detect_faces(self, frame):
+        """Detect faces with anti-spoofing; returns (face_objs, error) so one bad frame doesn't stop the rest"""
+        try:
+            # OPTIMIZED: Use DeepFace.extract_faces() for faster face detection only
+            face_objs = DeepFace.extract_faces(
+                img_path=frame,
+                enforce_detection=False,
+                detector_backend='yolov8',  # Fastest detector
+                anti_spoofing=True
             )
-
-            logger.info("Video analysis completed successfully")
-            return results
-
-        except ValueError as e:
-            # Input validation errors
-            logger.error(f"Input validation error during video analysis: {e}")
-            raise e
+            return face_objs, None
         except Exception as e:
-            # Unexpected errors
-            logger.error(f"Unexpected error during video analysis: {e}", exc_info=True)
-            raise Exception(f"Video analysis failed: {str(e)}") from e
+            return None, e
 
-        finally:
-            # Cleanup
-            try:
-                self.cleanup_resources()
-                logger.debug("Cleanup completed successfully")
-            except Exception as cleanup_error:
-                logger.warning(f"Error during cleanup: {cleanup_error}")
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _format_timestamp(timestamp: float) -> str:
+        """Format timestamp as MM:SS (sampled timestamps repeat, so results are cached)"""
+        seconds = int(timestamp)
+        return f"{seconds // 60:02d}:{seconds % 60:02d}"
 
     # This is for celery use
     def analyze_video_for_celery(self, video_data: dict):
@@ -187,25 +231,29 @@ class VideoProcessor:
                 f"Video metadata: {duration:.1f}s, {fps:.1f} fps, {frame_count} frames"
             )
 
-            # Analyze camera status using extracted frames
-            logger.info("Starting camera status analysis")
-            camera_analysis = self.analyze_camera_status_from_frames(
-                frames_data, duration, fps
-            )
+            with ThreadPoolExecutor(max_workers=1) as visual_executor:
+                # The visual intelligence analysis only needs the frames, so its
+                # Gemini round trip runs while the CPU-bound camera analysis works
+                logger.info("Starting visual intelligence analysis")
+                visual_future = visual_executor.submit(
+                    self._perform_visual_analysis_from_frames, frames_data
+                )
 
-            # Check if camera analysis was successful
-            if not camera_analysis.get("success", False):
-                error_msg = f"Camera analysis failed: {camera_analysis.get('error', 'Unknown error')}"
-                logger.error(error_msg)
-                raise Exception(error_msg)
+                # Analyze camera status using extracted frames
+                logger.info("Starting camera status analysis")
+                camera_analysis = self.analyze_camera_status_from_frames(
+                    frames_data, duration, fps
+                )
 
-            logger.info("Camera analysis completed successfully")
+                # Check if camera analysis was successful
+                if not camera_analysis.get("success", False):
+                    error_msg = f"Camera analysis failed: {camera_analysis.get('error', 'Unknown error')}"
+                    logger.error(error_msg)
+                    raise Exception(error_msg)
 
-            # Perform visual intelligence analysis
-            logger.info("Starting visual intelligence analysis")
-            attireAndBackgroundAnalysis = self._perform_visual_analysis_from_frames(
-                frames_data, camera_analysis["detailed_results"]["camera_timeline"]
-            )
+                logger.info("Camera analysis completed successfully")
+
+                attireAndBackgroundAnalysis = visual_future.result()
 
             video_response = VideoResponse()
             results = video_response._format_ui_friendly_results(
@@ -242,7 +290,7 @@ class VideoProcessor:
         across frames using face recognition.
 
         Args:
-            frames_data (dict): Dictionary mapping timestamp to frame data
+            frames_data (dict): Dictionary mapping timestamp to frame data, in chronological order
             duration (float): Video duration
             fps (float): Video FPS
 
@@ -253,133 +301,158 @@ class VideoProcessor:
         try:
             # Analysis tracking variables
             camera_timeline = []
-            person_timelines = {}  # Dictionary to track each person's camera status
+            person_timestamps = {}  # person_id -> timestamps where the person's face was seen
             static_image_alerts = []  # Track static image/spoofing detections
             face_detected_count = 0
             total_samples = 0
 
-            # Camera OFF period tracking
-            current_off_start = None
-            consecutive_off_count = 0
-
             logger.info(f"Analyzing {len(frames_data)} extracted frames")
 
             # Process each frame
-            for timestamp in sorted(frames_data.keys()):
-                frame = frames_data[timestamp]
-                total_samples += 1
-
-                detected_faces = []  # List of (person_id, bbox, is_spoofed)
-                current_persons = set()  # Track active persons in this frame
-
-                try:
-                    # OPTIMIZED: Use DeepFace.extract_faces() for faster face detection only
-                    face_objs = DeepFace.extract_faces(
-                        img_path=frame,
-                        enforce_detection=False,
-                        detector_backend='yolov8',  # Fastest detector
-                        anti_spoofing=True
-                    )
-
-                    if face_objs:
-                        for i, face_obj in enumerate(face_objs):
-                            # Check if face is real (anti-spoofing)
-                            is_real = face_obj.get("is_real", True)
-                            
-                            if is_real:
-                                # Get face image from face_obj
-                                face_img_normalized = face_obj.get("face", None)
-                                if face_img_normalized is None:
-                                    continue
-                                
-                                # Convert normalized face back to uint8 format
-                                face_img = (face_img_normalized * 255).astype(np.uint8)
-                                
-                                # Resize to standard size for matching
-                                face_img = cv2.resize(face_img, (224, 224))
-                                
-                                # Find matching person using DeepFace verification
-                                person_id = self._find_matching_person(face_img)
-                                if person_id is None:
-                                    person_id = self.next_person_id
-                                    self.person_embeddings[person_id] = []
-                                    self.next_person_id += 1
-                                
-                                # Store face image for future verification
-                                self.person_embeddings[person_id].append(face_img)
-                                if len(self.person_embeddings[person_id]) > MAX_EMBEDDING_HISTORY:
-                                    self.person_embeddings[person_id].pop(0)
-                                
-                                # Create simple display image for UI (no bounding box since extract_faces doesn't provide coordinates)
-                                self.person_display_images[person_id] = face_img
-                                
-                                # Add to detected faces
-                                detected_faces.append((person_id, face_img, False))
-                                current_persons.add(person_id)
-                            else:
-                                # Spoofed face detected - just log it, no UI processing needed
-                                static_image_alerts.append({
-                                    "timestamp": self._format_timestamp(timestamp),
-                                    "is_real": is_real
-                                })
-                                logger.info(f"Static/spoofed face detected at timestamp {self._format_timestamp(timestamp)}")
-                                
-                except Exception as e:
-                    logger.error(f"Face detection error: {e}")
-                    
-                # Log progress every 10 frames
-                if total_samples % 10 == 0:
-                    logger.debug(
-                        f"Frame {total_samples}: {len(detected_faces)} faces detected at {timestamp:.1f}s"
-                    )
+            timestamps = list(frames_data)  # the extractor returns frames in chronological order
+            repeats = self._repeated_frames([frames_data[t] for t in timestamps])
+            with ThreadPoolExecutor(max_workers=1) as detector:
+                # Face detection runs up to DETECTION_LOOKAHEAD frames ahead on its
+                # own thread (the detector and anti-spoofing models release the GIL)
+                # while this loop embeds and matches the faces already detected
+                detections = _lookahead_map(
+                    detector,
+                    self._detect_faces,
+                    (frames_data[t] for t, repeat in zip(timestamps, repeats) if not repeat),
+                    max(1, DETECTION_LOOKAHEAD),
+                )
+                detected_faces = []
+                spoofed_faces = 0
+                for timestamp, repeat in zip(timestamps, repeats):
+                    total_samples += 1
+
+                    if repeat:
+                        # Same shot as the last analysed sample, so the same people
+                        # are on camera: reuse its faces instead of running the models
+                        static_image_alerts.extend(
+                            {"timestamp": self._format_timestamp(timestamp), "is_real": False}
+                            for _ in range(spoofed_faces)
+                        )
+                    else:
+                        face_objs, detection_error = next(detections)
+                        detected_faces = []  # List of (person_id, bbox, is_spoofed)
+                        spoofed_faces = 0
+
+                        try:
+                            if detection_error is not None:
+                                raise detection_error
+
+                            if face_objs:
+                                real_faces = []  # (face image, embedding) per real face
+
+                                for face_obj in face_objs:
+                                    # Check if face is real (anti-spoofing)
+                                    is_real = face_obj.get("is_real", True)
+
+                                    if is_real:
+                                        # Get face image from face_obj
+                                        face_img_normalized = face_obj.get("face", None)
+                                        if face_img_normalized is None:
+                                            continue
+
+                                        # Resize to the standard matching size first, then
+                                        # scale back to uint8 in one pass: the crop itself is
+                                        # never copied or multiplied at full resolution
+                                        face_img = cv2.convertScaleAbs(
+                                            cv2.resize(face_img_normalized, (224, 224)), alpha=255
+                                        )
+                                        real_faces.append((face_img, self._face_embedding(face_img)))
+                                    else:
+                                        # Spoofed face detected - just log it, no UI processing needed
+                                        spoofed_faces += 1
+                                        static_image_alerts.append({
+                                            "timestamp": self._format_timestamp(timestamp),
+                                            "is_real": is_real
+                                        })
+                                        logger.info(f"Static/spoofed face detected at timestamp {self._format_timestamp(timestamp)}")
+
+                                # Match all of the frame's faces to known persons at once
+                                person_ids = self._assign_persons([e for _, e in real_faces])
+
+                                for (face_img, embedding), person_id in zip(real_faces, person_ids):
+                                    if person_id is None:
+                                        person_id = self.next_person_id
+                                        self.person_embeddings[person_id] = deque(maxlen=MAX_EMBEDDING_HISTORY)
+                                        self.next_person_id += 1
+
+                                    # Store embedding for future matching (the deque drops the oldest)
+                                    if embedding is not None:
+                                        self.person_embeddings[person_id].append(embedding)
+
+                                    # Create simple display image for UI (no bounding box since extract_faces doesn't provide coordinates)
+                                    self.person_display_images[person_id] = face_img
+
+                                    # Add to detected faces (the crop itself is only kept
+                                    # as the person's display image)
+                                    detected_faces.append((person_id, None, False))
+
+                        except Exception as e:
+                            logger.error(f"Face detection error: {e}")
+
+                    # Log progress every 10 frames
+                    if total_samples % 10 == 0:
+                        logger.debug(
+                            f"Frame {total_samples}: {len(detected_faces)} faces detected at {timestamp:.1f}s"
+                        )
+
+                    # Record the frame in each detected person's timeline; the
+                    # timeline events are only built once, after the loop
+                    for person_id, face_data, is_spoofed in detected_faces:
+                        if person_id is not None:  # Only track real faces
+                            person_timestamps.setdefault(person_id, []).append(timestamp)
+
+                    # Check if this frame indicates camera off period
+                    frame_camera_on = any(not f[2] for f in detected_faces)  # Any non-spoofed face
+
+                    # Add timeline event for every frame
+                    camera_timeline.append({
+                        "timestamp": timestamp,
+                        "camera_on": frame_camera_on,
+                        "face_detected": frame_camera_on
+                    })
 
-                # Update person timelines for valid faces
-                for person_id, face_data, is_spoofed in detected_faces:
-                    if person_id is not None:  # Only track real faces
-                        # Add to person's timeline if not already tracking
-                        if person_id not in person_timelines:
-                            person_timelines[person_id] = []
-                        
-                        # Add timeline entry (simplified since we don't have exact bbox coordinates)
-                        person_timelines[person_id].append({
-                            "timestamp": timestamp,
-                            "camera_on": True,
-                            "face_detected": True
-                        })
-                            
-                # Check if this frame indicates camera off period
-                frame_camera_on = len([f for f in detected_faces if not f[2]]) > 0  # Count non-spoofed faces
-                
-                # Add timeline event for every frame
-                camera_timeline.append({
-                    "timestamp": timestamp,
-                    "camera_on": frame_camera_on,
-                    "face_detected": frame_camera_on
-                })
-                
-                if frame_camera_on:
-                    face_detected_count += 1
-                    consecutive_off_count = 0
-                else:
-                    consecutive_off_count += 1
+                    if frame_camera_on:
+                        face_detected_count += 1
                         
             # Calculate statistics
-            total_off_duration = 0  # Will be calculated from camera timeline later
             camera_availability = round((face_detected_count / total_samples) * 100, 1) if total_samples > 0 else 0
 
+            # Person timelines only hold frames where the person's face was seen
+            # (simplified since we don't have exact bbox coordinates)
+            person_timelines = {
+                person_id: [
+                    {"timestamp": t, "camera_on": True, "face_detected": True}
+                    for t in seen
+                ]
+                for person_id, seen in person_timestamps.items()
+            }
+
+            # Encode every person's face image up front, in parallel
+            # (cv2.imencode releases the GIL)
+            display_ids = [p for p in person_timestamps if p in self.person_display_images]
+            face_images_b64 = {}
+            if display_ids:
+                with ThreadPoolExecutor(max_workers=min(4, len(display_ids))) as encoder:
+                    face_images_b64 = dict(zip(display_ids, encoder.map(
+                        self._image_to_base64,
+                        (self.person_display_images[p] for p in display_ids),
+                    )))
+
             # Generate person statistics with face images
             person_stats = {}
-            for person_id, timeline in person_timelines.items():
-                on_count = sum(1 for event in timeline if event.get("camera_on", False))
-                total_count = len(timeline) if timeline else 1  # Avoid division by zero
+            for person_id, seen in person_timestamps.items():
+                on_count = len(seen)
+                total_count = len(seen) if seen else 1  # Avoid division by zero
                 
                 on_percentage = (on_count / total_count * 100) if total_count > 0 else 0
                 
                 # Get the latest face image with bounding box for this person
-                face_image_b64 = None
-                if person_id in self.person_display_images:
-                    display_image = self.person_display_images[person_id]
-                    face_image_b64 = self._image_to_base64(display_image)
+                face_image_b64 = face_images_b64.get(person_id)
                 
                 person_stats[person_id] = {
                     "camera_on_percentage": round(on_percentage, 2),
@@ -414,6 +487,7 @@ class VideoProcessor:
 
             # Calculate off periods from camera timeline
             off_periods = self._detect_off_periods(camera_timeline)
+            total_off_duration = sum(p["duration"] for p in off_periods)
 
             # Format results
             detailed_results = {
@@ -487,14 +561,18 @@ class VideoProcessor:
 
         return off_periods
 
+    def _dhash(self, frame) -> int:
+        """64-bit difference hash of a frame, for spotting near-identical frames"""
+        gray = cv2.resize(cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY), (9, 8), interpolation=cv2.INTER_AREA)
+        return int.from_bytes(np.packbits(gray[:, 1:] > gray[:, :-1]).tobytes(), "big")
+
     def _encode_frame_to_base64(self, frame):
         """Encode a frame to base64 for Gemini API"""
         try:
-            # Convert BGR to RGB (Gemini expects RGB)
-            frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-
-            # Encode to JPEG
-            _, buffer = cv2.imencode(".jpg", frame_rgb, [cv2.IMWRITE_JPEG_QUALITY, 85])
+            # Frames come from ffmpeg as bgr24, already downscaled, which is the
+            # layout imencode expects (the JPEG itself is stored as RGB/YCbCr),
+            # so no Python-side resize or channel swap is needed
+            _, buffer = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, 85])
 
             # Convert to base64
             base64_image = base64.b64encode(buffer).decode("utf-8")
@@ -507,10 +585,10 @@ class VideoProcessor:
     def _image_to_base64(self, image):
         """Convert an image (face image with bounding box) to base64 for UI display"""
         try:
-            # Handle both BGR and RGB images
+            # DeepFace face crops are RGB while imencode expects BGR; this swap
+            # runs once per person when the results are built, not per frame
             if len(image.shape) == 3:
-                # If it's BGR (OpenCV default), convert to RGB for web display
-                image_rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+                image_rgb = cv2.cvtColor(image, cv2.COLOR_RGB2BGR)
             else:
                 image_rgb = image
             
@@ -525,14 +603,13 @@ class VideoProcessor:
             logger.error(f"Error converting image to base64: {e}")
             return None
 
-    def _perform_visual_analysis_from_frames(self, frames_data, camera_timeline):
+    def _perform_visual_analysis_from_frames(self, frames_data):
         """
         Perform attire and background analysis on selected frames using pre-extracted frame data
         Optimized to make a single Gemini API call for all frames
 
         Args:
             frames_data: Dictionary mapping timestamp to frame data
-            camera_timeline: Timeline with face detection data
 
         Returns:
             dict: Visual analysis results
@@ -541,7 +618,7 @@ class VideoProcessor:
             logger.info("Starting visual intelligence analysis from extracted frames")
 
             # Select best frames for analysis - use simple timestamp-based selection
-            if not camera_timeline:
+            if not frames_data:
                 return AttireAndBackgroundAnalysis(
                     success=False,
                     attire_analysis="No frames available for analysis",
@@ -568,6 +645,7 @@ class VideoProcessor:
             # Prepare frames for batch analysis
             valid_frames = []
             valid_timestamps = []
+            sent_hashes = []
 
             for timestamp in selected_timestamps:
                 # Get frame from pre-extracted data
@@ -576,6 +654,14 @@ class VideoProcessor:
                     logger.warning(f"Frame not available at {timestamp:.1f}s")
                     continue
 
+                # Skip frames that look the same as one already selected (a
+                # static counseling shot) so Gemini isn't sent duplicate images
+                frame_hash = self._dhash(frame)
+                if any(bin(frame_hash ^ h).count("1") < VISUAL_DUPLICATE_BITS for h in sent_hashes):
+                    logger.debug(f"Skipping near-duplicate frame at {timestamp:.1f}s")
+                    continue
+                sent_hashes.append(frame_hash)
+
                 valid_frames.append(frame)
                 valid_timestamps.append(timestamp)
 
@@ -592,10 +678,9 @@ class VideoProcessor:
             # Perform batch analysis for all frames at once
             logger.info(f"Analyzing {len(valid_frames)} frames in a single batch")
 
-            # Encode frames
-            encoded_frames = [
-                self._encode_frame_to_base64(frame) for frame in valid_frames
-            ]
+            # Encode frames in parallel (cv2.imencode releases the GIL)
+            with ThreadPoolExecutor(max_workers=len(valid_frames)) as encoder:
+                encoded_frames = list(encoder.map(self._encode_frame_to_base64, valid_frames))
             encoded_frames = [f for f in encoded_frames if f]
 
             if not encoded_frames:
@@ -677,3 +762,9 @@ class VideoProcessor:
         except Exception as e:
             logger.error(f"Error in batch analysis: {str(e)}", exc_info=True)
             return AttireAndBackgroundAnalysis(success=False, error=str(e))
+
+
+@lru_cache(maxsize=1)
+def get_video_processor() -> VideoProcessor:
+    """Return the per-process VideoProcessor so models are loaded only once"""
+    return VideoProcessor()
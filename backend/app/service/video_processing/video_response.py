@@ -1,5 +1,6 @@
 import os
 from datetime import datetime
+from functools import lru_cache
 
 MIN_OFF_PERIOD_DURATION = int(os.getenv("MIN_OFF_PERIOD_DURATION", "6"))  # Minimum seconds for significant off period
 
@@ -139,9 +140,9 @@ class VideoResponse:
             issues.append("Low camera engagement")
         if stats.get('using_static_image', False):
             issues.append("Using static image")
-        if len([p for p in off_periods if p['duration'] > 300]) > 0:
+        if any(p['duration'] > 300 for p in off_periods):
             issues.append("Extended absence periods")
-        if len([p for p in off_periods if p['duration'] > 30]) > 5:
+        if sum(1 for p in off_periods if p['duration'] > 30) > 5:
             issues.append("Frequent interruptions")
 
         return {
@@ -209,10 +210,10 @@ class VideoResponse:
             'total_participants': len(participants),
             'overall_engagement': {
                 'average_camera_on': round(avg_engagement, 1),
-                'participants_engaged': len([p for p in participants.values() 
-                                           if p['engagement_summary']['overall_status'] == 'engaged']),
-                'participants_with_issues': len([p for p in participants.values() 
-                                               if p['behavior_insights']['notable_issues']])
+                'participants_engaged': sum(1 for p in participants.values()
+                                            if p['engagement_summary']['overall_status'] == 'engaged'),
+                'participants_with_issues': sum(1 for p in participants.values()
+                                                if p['behavior_insights']['notable_issues'])
             },
             'session_quality': session_quality
         }
@@ -240,8 +241,8 @@ class VideoResponse:
         """Generate actionable recommendations"""
         recommendations = []
         
-        low_engagement_count = len([p for p in participants.values() 
-                                   if p['engagement_summary']['camera_on_percentage'] < 50])
+        low_engagement_count = sum(1 for p in participants.values()
+                                   if p['engagement_summary']['camera_on_percentage'] < 50)
         if low_engagement_count > 0:
             recommendations.append({
                 'category': 'engagement',
@@ -282,9 +283,12 @@ class VideoResponse:
             return f"{hours}h {minutes}m"
 
 
-    def _format_timestamp(self, timestamp: float) -> str:
-        """Format timestamp as MM:SS"""
-        return f"{int(timestamp//60):02d}:{int(timestamp%60):02d}"
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _format_timestamp(timestamp: float) -> str:
+        """Format timestamp as MM:SS (sampled timestamps repeat, so results are cached)"""
+        seconds = int(timestamp)
+        return f"{seconds // 60:02d}:{seconds % 60:02d}"
     
     def _validate_camera_analysis(self, camera_analysis):
         """Validate camera analysis data structure"""